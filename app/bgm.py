@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import functools
 import logging
+import os
 import threading
 import time
+import wave
 from typing import Optional
 
+from .cache import CACHE_ROOT, cache_key
+
 try:
     import pygame
     from pygame import mixer
@@ -12,10 +17,94 @@ except Exception:  # noqa: BLE001
     pygame = None  # type: ignore[assignment]
     mixer = None  # type: ignore[assignment]
 
+try:
+    import numpy as np
+except Exception:  # noqa: BLE001
+    np = None  # type: ignore[assignment]
+
 
 logger = logging.getLogger(__name__)
 
 
+# Mixer channel reserved for synthesized speech; background music streams via
+# mixer.music, so both are mixed by SDL in the same output.
+SPEECH_CHANNEL = 0
+
+
+def init_mixer(buffer_size: int = 512) -> None:
+    """Open the shared pygame mixer if needed and reserve the speech channel."""
+    if not mixer.get_init():
+        # A small buffer keeps volume changes audible within ~12 ms
+        mixer.init(frequency=44100, size=-16, channels=2, buffer=buffer_size)
+    mixer.set_reserved(SPEECH_CHANNEL + 1)
+
+
+@functools.lru_cache(maxsize=None)
+def _fallback_paths(path: str) -> tuple[str, ...]:
+    """Existing .wav/.ogg siblings of ``path``, stat'ed once per path per process."""
+    base, _ = os.path.splitext(path)
+    return tuple(p for p in (f"{base}.wav", f"{base}.ogg") if os.path.exists(p))
+
+
+# Frames amplified per step when boosting the track; bounds the temporary arrays
+_GAIN_CHUNK_FRAMES = 1 << 16
+
+
+def _gain_cache_path(music_path: str, gain: float, frequency: int, channels: int) -> str:
+    """
+    Where the boosted copy of a track lives; changes whenever the source or settings do.
+
+    The name starts with a key of the source path alone, so older copies of the
+    same track can be found and removed.
+    """
+    stat = os.stat(music_path)
+    source = cache_key(os.path.abspath(music_path))
+    key = cache_key(str(stat.st_mtime_ns), str(stat.st_size), f"{gain:.4f}", str(frequency), str(channels))
+    return os.path.join(CACHE_ROOT, "bgm", f"{source}-{key}.wav")
+
+
+def _remove_stale_gain_files(path: str) -> None:
+    """Delete boosted copies of the same track made with other settings; each is a full-length WAV."""
+    directory, name = os.path.split(path)
+    prefix = name.split("-", 1)[0] + "-"
+    for entry in os.listdir(directory):
+        if entry.startswith(prefix) and entry.endswith(".wav") and entry != name:
+            try:
+                os.remove(os.path.join(directory, entry))
+            except OSError:
+                logger.warning("Could not remove stale background music file %s", entry)
+
+
+def _write_gained_wav(music_path: str, out_path: str, gain: float, frequency: int, channels: int) -> None:
+    """
+    Decode ``music_path`` once and write it to ``out_path`` with ``gain`` applied.
+
+    Samples are amplified a chunk at a time in int32 (fixed point) straight from
+    the decoded buffer, so the only full-size copy is the decode itself.
+    """
+    sound = mixer.Sound(music_path)
+    samples = pygame.sndarray.samples(sound)  # view of the decoded buffer, not a copy
+    scale = int(round(gain * 256))
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    try:
+        with wave.open(tmp_path, "wb") as wav:
+            wav.setnchannels(channels)
+            wav.setsampwidth(2)
+            wav.setframerate(frequency)
+            for start in range(0, len(samples), _GAIN_CHUNK_FRAMES):
+                chunk = samples[start:start + _GAIN_CHUNK_FRAMES].astype(np.int32)
+                chunk *= scale
+                chunk >>= 8
+                np.clip(chunk, -32768, 32767, out=chunk)
+                wav.writeframes(chunk.astype(np.int16).tobytes())
+        os.replace(tmp_path, out_path)
+    finally:
+        del samples, sound
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
 class BackgroundMusicManager:
     def __init__(
         self,
@@ -24,17 +113,30 @@ class BackgroundMusicManager:
         initial_volume: float = 0.4,
         ducked_volume: float = 0.1,
         fade_seconds: float = 1.0,
+        buffer_size: int = 512,
     ) -> None:
         logger.info(f"Initializing background music manager with path: {music_path}")
         self._music_path = music_path
+        # The mixer volume tops out at 1.0; anything above that is applied as
+        # digital gain on the decoded samples when the track is loaded.
         self._initial_volume = max(0.0, min(1.0, initial_volume))
+        self._gain = max(1.0, initial_volume)
+        # Only this manager sets the mixer volume, so track it here instead of
+        # asking SDL_mixer for it on every duck/unduck.
+        self._current_volume = self._initial_volume
         self._ducked_volume = max(0.0, min(1.0, ducked_volume))
         self._fade_seconds = max(0.0, fade_seconds)
+        self._buffer_size = max(64, buffer_size)
 
         self._lock = threading.RLock()
         self._running = False
         self._ready = False
 
+        # Fades run on a short-lived worker so duck/unduck never block on them.
+        # Each fade owns a cancel event; starting a new fade cancels the previous one.
+        self._fade_lock = threading.Lock()
+        self._fade_cancel = threading.Event()
+
     def _ensure_init(self) -> None:
         if self._ready:
             return
@@ -45,8 +147,7 @@ class BackgroundMusicManager:
             logger.warning("pygame not available; background music disabled")
             return
         try:
-            if not mixer.get_init():
-                mixer.init()
+            init_mixer(self._buffer_size)
             # Try normal load first
             try:
                 mixer.music.load(self._music_path)
@@ -56,23 +157,22 @@ class BackgroundMusicManager:
                     mixer.music.load(self._music_path, namehint="mp3")
                 except Exception:
                     # If mp3 fails, try same basename with .wav or .ogg if available
-                    import os
-                    base, _ = os.path.splitext(self._music_path)
-                    fallback_paths = [f"{base}.wav", f"{base}.ogg"]
                     loaded = False
-                    for p in fallback_paths:
-                        if os.path.exists(p):
-                            try:
-                                mixer.music.load(p)
-                                self._music_path = p
-                                loaded = True
-                                logger.info("Background music fell back to: %s", p)
-                                break
-                            except Exception:
-                                continue
+                    for p in _fallback_paths(self._music_path):
+                        try:
+                            mixer.music.load(p)
+                            self._music_path = p
+                            loaded = True
+                            logger.info("Background music fell back to: %s", p)
+                            break
+                        except Exception:
+                            continue
                     if not loaded:
                         raise
+            if self._gain > 1.0:
+                self._apply_gain()
             mixer.music.set_volume(self._initial_volume)
+            self._current_volume = self._initial_volume
             self._ready = True
             logger.info("Background music initialized: %s", self._music_path)
         except Exception:  # noqa: BLE001
@@ -82,10 +182,35 @@ class BackgroundMusicManager:
             )
             self._ready = False
 
+    def _apply_gain(self) -> None:
+        """Reload the track with ``self._gain`` applied to its samples, hard-clipped to int16."""
+        if np is None:
+            logger.warning("numpy not available; background music gain above 1.0 ignored")
+            return
+        frequency, fmt, channels = mixer.get_init()
+        if fmt != -16:
+            logger.warning("Mixer format %s is not signed 16-bit; background music gain ignored", fmt)
+            return
+        try:
+            path = _gain_cache_path(self._music_path, self._gain, frequency, channels)
+            if not os.path.exists(path):
+                _write_gained_wav(self._music_path, path, self._gain, frequency, channels)
+                _remove_stale_gain_files(path)
+            # Streamed from disk like the original track, so nothing stays in memory
+            mixer.music.load(path)
+            logger.info("Applied %.2fx gain to background music", self._gain)
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to apply background music gain; playing at unity")
+            mixer.music.load(self._music_path)
+
     def start(self) -> None:
         with self._lock:
             self._ensure_init()
-            if not self._ready or self._running:
+            if not self._ready:
+                # Music is unavailable for the rest of the session; make ducking free
+                self.duck = self.unduck = self._noop  # type: ignore[method-assign]
+                return
+            if self._running:
                 return
             try:
                 mixer.music.play(-1)  # loop forever
@@ -98,53 +223,70 @@ class BackgroundMusicManager:
         with self._lock:
             if not self._ready:
                 return
+            self._fade_cancel.set()
             try:
+                # fadeout() stops playback once the fade completes; calling stop()
+                # right after would cut the fade short.
                 mixer.music.fadeout(int(self._fade_seconds * 1000))
             except Exception:  # noqa: BLE001
                 logger.exception("Failed to fadeout background music")
             finally:
-                try:
-                    mixer.music.stop()
-                except Exception:  # noqa: BLE001
-                    pass
                 self._running = False
 
     def _tween_volume(self, start: float, end: float, duration: float) -> None:
-        if not self._ready:
+        self._fade_cancel.set()
+        if duration <= 0:
+            # No fade configured: switch volume right away, no worker thread
+            try:
+                mixer.music.set_volume(end)
+                self._current_volume = end
+            except Exception:  # noqa: BLE001
+                logger.exception("Failed to set background music volume")
             return
-        steps = max(1, int(duration * 30))  # ~30 FPS
-        dv = (end - start) / steps
-        v = start
-        for _ in range(steps):
-            v = max(0.0, min(1.0, v + dv))
+        cancel = threading.Event()
+        self._fade_cancel = cancel
+        threading.Thread(
+            target=self._fade_worker,
+            args=(start, end, duration, cancel),
+            name="BGMFade",
+            daemon=True,
+        ).start()
+
+    def _fade_worker(self, start: float, end: float, duration: float, cancel: threading.Event) -> None:
+        with self._fade_lock:
+            if cancel.is_set():
+                return
+            steps = max(1, int(duration * 10))  # ~10 FPS; the mixer smooths in between
+            dv = (end - start) / steps
+            v = start
+            # Wait for absolute deadlines so scheduler jitter can't stretch the fade,
+            # and on the cancel event so a newer fade takes over immediately.
+            t0 = time.monotonic()
             try:
-                mixer.music.set_volume(v)
+                for i in range(steps):
+                    v = max(0.0, min(1.0, v + dv))
+                    mixer.music.set_volume(v)
+                    self._current_volume = v
+                    deadline = t0 + (i + 1) * duration / steps
+                    if cancel.wait(timeout=max(0.0, deadline - time.monotonic())):
+                        return
+                mixer.music.set_volume(end)
+                self._current_volume = end
             except Exception:  # noqa: BLE001
-                break
-            time.sleep(duration / steps if steps > 0 else 0)
-        try:
-            mixer.music.set_volume(end)
-        except Exception:  # noqa: BLE001
-            pass
+                # Mixer went away (e.g. shut down mid-fade); nothing left to fade
+                return
+
+    def _noop(self) -> None:
+        pass
 
     def duck(self) -> None:
         with self._lock:
-            if not self._ready or not self._running:
+            if not self._running:
                 return
-            try:
-                current = mixer.music.get_volume()
-            except Exception:  # noqa: BLE001
-                current = self._initial_volume
-            self._tween_volume(current, self._ducked_volume, self._fade_seconds)
+            self._tween_volume(self._current_volume, self._ducked_volume, self._fade_seconds)
 
     def unduck(self) -> None:
         with self._lock:
-            if not self._ready or not self._running:
+            if not self._running:
                 return
-            try:
-                current = mixer.music.get_volume()
-            except Exception:  # noqa: BLE001
-                current = self._ducked_volume
-            self._tween_volume(current, self._initial_volume, self._fade_seconds)
-
-
+            self._tween_volume(self._current_volume, self._initial_volume, self._fade_seconds)
@@ -0,0 +1,51 @@
+"""
+On-disk caches shared by the fetch/summarize pipeline.
+
+Every cache lives under ``CACHE_ROOT`` in its own directory and expires entries
+by TTL.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+from typing import Any, Optional
+
+import diskcache
+
+
+CACHE_ROOT = os.path.expanduser("~/.sleep_assistant")
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+
+def cache_key(*parts: str) -> str:
+    """Stable key for any combination of strings."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    Thin wrapper around ``diskcache.Cache`` with a default TTL.
+
+    The directory is opened on first use, so importing a module that declares a
+    cache costs nothing.
+    """
+
+    def __init__(self, name: str, ttl: float = DEFAULT_TTL_SECONDS):
+        self.directory = os.path.join(CACHE_ROOT, name)
+        self.ttl = ttl
+
+    @functools.cached_property
+    def _cache(self) -> diskcache.Cache:
+        return diskcache.Cache(self.directory)
+
+    def get(self, key: str) -> Optional[Any]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        self._cache.set(key, value, expire=self.ttl)
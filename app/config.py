@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import functools
+import math
 import os
 from dataclasses import dataclass
 from typing import Optional
@@ -12,6 +14,9 @@ class AppConfig:
     elevenlabs_api_key: str
     elevenlabs_voice_id: str
     elevenlabs_model_id: str = "eleven_turbo_v2"
+    elevenlabs_output_format: str = "pcm_24000"
+    # 'auto', 'pygame', 'sounddevice', 'subprocess' or 'elevenlabs' (see app/playback/backends.py)
+    playback_backend: str = "auto"
 
     queue_maxsize: int = 50
     low_watermark: int = 1
@@ -22,6 +27,7 @@ class AppConfig:
     bgm_initial_volume: float = 2.0
     bgm_ducked_volume: float = 0.1
     bgm_fade_seconds: float = 1.0
+    bgm_buffer_size: int = 512
 
     # Reddit API settings
     reddit_client_id: Optional[str] = None
@@ -31,15 +37,36 @@ class AppConfig:
     reddit_user_agent: str = "script:worldnews-top:v1.1 (by /u/your_username)"
 
 
-def load_config(env_file: Optional[str] = None) -> AppConfig:
-    if env_file:
-        load_dotenv(env_file)
-    else:
-        load_dotenv()
+# Clamp bounds for the float BGM settings. Initial volume above 1.0 is applied
+# as digital gain by the BGM manager, so it is only bounded below.
+_BGM_FLOAT_SPECS: dict[str, tuple[float, float]] = {
+    "BGM_INITIAL_VOLUME": (0.0, math.inf),
+    "BGM_DUCKED_VOLUME": (0.0, 1.0),
+    "BGM_FADE_SECONDS": (0.0, math.inf),
+}
+
+# env files already sourced into os.environ; each is read at most once per process
+_DOTENV_LOADED: set[Optional[str]] = set()
+
 
-    api_key = os.getenv("ELEVENLABS_API_KEY")
+@functools.lru_cache(maxsize=None)
+def load_config(env_file: Optional[str] = None) -> AppConfig:
+    """Load the app config once per env file; call ``load_config.cache_clear()`` to reload."""
+    if env_file not in _DOTENV_LOADED:
+        if env_file:
+            load_dotenv(env_file)
+        else:
+            load_dotenv()
+        _DOTENV_LOADED.add(env_file)
+
+    # Snapshot the environment once; every setting below is a plain dict lookup
+    env = dict(os.environ)
+
+    api_key = env.get("ELEVENLABS_API_KEY")
     voice_id = "qWdiyiWdNPlPyVCOLW0h"
-    model_id = os.getenv("ELEVENLABS_MODEL_ID", "eleven_v3")
+    model_id = env.get("ELEVENLABS_MODEL_ID", "eleven_v3")
+    output_format = env.get("ELEVENLABS_OUTPUT_FORMAT", "pcm_24000")
+    playback_backend = env.get("PLAYBACK_BACKEND", "auto")
 
     if not api_key:
         raise RuntimeError(
@@ -50,9 +77,9 @@ def load_config(env_file: Optional[str] = None) -> AppConfig:
             "ELEVENLABS_VOICE_ID is required. Set it in your environment or .env file."
         )
 
-    queue_maxsize_str = os.getenv("QUEUE_MAXSIZE", "50")
-    low_watermark_str = os.getenv("LOW_WATERMARK", "1")
-    batch_count_str = os.getenv("BATCH_PRODUCE_COUNT", "1")
+    queue_maxsize_str = env.get("QUEUE_MAXSIZE", "50")
+    low_watermark_str = env.get("LOW_WATERMARK", "1")
+    batch_count_str = env.get("BATCH_PRODUCE_COUNT", "1")
 
     try:
         queue_maxsize = int(queue_maxsize_str)
@@ -64,32 +91,37 @@ def load_config(env_file: Optional[str] = None) -> AppConfig:
         ) from exc
 
     # Background music envs (optional)
-    bgm_path = os.getenv("BGM_PATH", "background_music.mp3")  # can be None; user will provide later
+    bgm_path = env.get("BGM_PATH", "background_music.mp3")  # can be None; user will provide later
     def _parse_float(name: str, default: float) -> float:
-        v = os.getenv(name)
-        if v is None:
-            return default
+        v = env.get(name)
         try:
-            f = float(v)
+            f = default if v is None else float(v)
         except ValueError as exc:
             raise RuntimeError(f"{name} must be a float") from exc
-        return max(0.0, min(1.0, f)) if name != "BGM_FADE_SECONDS" else max(0.0, f)
+        lo, hi = _BGM_FLOAT_SPECS[name]
+        return max(lo, min(hi, f))
 
     bgm_initial_volume = _parse_float("BGM_INITIAL_VOLUME", 2.0)
     bgm_ducked_volume = _parse_float("BGM_DUCKED_VOLUME", 0.1)
     bgm_fade_seconds = _parse_float("BGM_FADE_SECONDS", 1.0)
+    try:
+        bgm_buffer_size = int(env.get("BGM_BUFFER_SIZE", "512"))
+    except ValueError as exc:
+        raise RuntimeError("BGM_BUFFER_SIZE must be an integer") from exc
 
     # Reddit API settings (optional)
-    reddit_client_id = os.getenv("REDDIT_CLIENT_ID")
-    reddit_client_secret = os.getenv("REDDIT_CLIENT_SECRET")
-    reddit_username = os.getenv("REDDIT_USERNAME")
-    reddit_password = os.getenv("REDDIT_PASSWORD")
-    reddit_user_agent = os.getenv("REDDIT_USER_AGENT", "script:worldnews-top:v1.1 (by /u/your_username)")
+    reddit_client_id = env.get("REDDIT_CLIENT_ID")
+    reddit_client_secret = env.get("REDDIT_CLIENT_SECRET")
+    reddit_username = env.get("REDDIT_USERNAME")
+    reddit_password = env.get("REDDIT_PASSWORD")
+    reddit_user_agent = env.get("REDDIT_USER_AGENT", "script:worldnews-top:v1.1 (by /u/your_username)")
 
     return AppConfig(
         elevenlabs_api_key=api_key,
         elevenlabs_voice_id=voice_id,
         elevenlabs_model_id=model_id,
+        elevenlabs_output_format=output_format,
+        playback_backend=playback_backend,
         queue_maxsize=queue_maxsize,
         low_watermark=low_watermark,
         batch_produce_count=batch_produce_count,
@@ -97,6 +129,7 @@ def load_config(env_file: Optional[str] = None) -> AppConfig:
         bgm_initial_volume=bgm_initial_volume,
         bgm_ducked_volume=bgm_ducked_volume,
         bgm_fade_seconds=bgm_fade_seconds,
+        bgm_buffer_size=bgm_buffer_size,
         reddit_client_id=reddit_client_id,
         reddit_client_secret=reddit_client_secret,
         reddit_username=reddit_username,
@@ -1,21 +1,16 @@
 from __future__ import annotations
 
-import asyncio
-import io
 import logging
 import threading
-import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional
-from queue import Queue, Empty
-import shutil
-import subprocess
-import signal
-import os
-
-from .tts_elevenlabs import ElevenLabsTTS, ElevenLabsConfig
+from typing import Callable, Deque, Optional
+from queue import Empty
+
+from .tts_elevenlabs import ElevenLabsTTS
 from .bgm import BackgroundMusicManager
-from elevenlabs.play import play
+from .fast_queue import FastQueue
 
 
 logger = logging.getLogger(__name__)
@@ -27,12 +22,22 @@ class ConsumerConfig:
 
 
 class ConsumerThread(threading.Thread):
+    """
+    Speaks queued paragraphs one at a time.
+
+    Each queue item is a list of paragraphs: one paragraph when the producer
+    streams, the whole output of a news batch otherwise. The consumer takes a
+    whole list at once and plays its paragraphs in order.
+    """
+
     def __init__(
         self,
-        queue: Queue[str],
+        queue: FastQueue[list[str]],
         wake_producer_event: threading.Event,
+        items_available: threading.Event,
         stop_event: threading.Event,
         tts: ElevenLabsTTS,
+        playback_fn: Callable[[bytes], None],
         config: ConsumerConfig,
         bgm: Optional[BackgroundMusicManager] = None,
         *,
@@ -42,48 +47,89 @@ class ConsumerThread(threading.Thread):
         super().__init__(name=name, daemon=daemon)
         self._queue = queue
         self._wake_producer_event = wake_producer_event
+        self._items_available = items_available
         self._stop_event = stop_event
         self._tts = tts
+        self._playback_fn = playback_fn
         self._config = config
         self._bgm = bgm
+        self._error_backoff = 0.0
+        self._waiting_for_items = False
+        # Paragraphs of the batch currently being spoken
+        self._pending: Deque[str] = deque()
+        # Synthesis of the next queued item runs while the current one plays
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="TTSPrefetch")
+        self._prefetched: Optional[tuple[str, Future[bytes]]] = None
 
     def run(self) -> None:  # noqa: D401
         while not self._stop_event.is_set():
             try:
-                text = self._queue.get(timeout=0.2)
+                text = self._next_text()
             except Empty:
-                # If queue is empty, signal producer and keep waiting until queue is filled
-                if self._queue.qsize() <= self._config.low_watermark:
+                # If queue is empty, signal producer and block until it reports new items
+                if len(self._queue) <= self._config.low_watermark:
                     self._wake_producer_event.set()
-                    # Keep waiting until queue has items or stop event is set
-                    while not self._stop_event.is_set() and self._queue.qsize() <= self._config.low_watermark:
-                        logger.info(f"Queue is below low-watermark; waiting for items... {self._queue.qsize()}")
-                        time.sleep(1)
+                    if not self._waiting_for_items:
+                        self._waiting_for_items = True
+                        logger.debug("Queue is below low-watermark; waiting for items... %d", len(self._queue))
+                    self._items_available.wait(timeout=1.0)
+                    if self._queue.empty():
+                        self._items_available.clear()
                 continue
+            self._waiting_for_items = False
 
             try:
                 if self._stop_event.is_set():
                     break
-                logger.info(f"Synthesizing audio for text: {text}")
-                audio = self._tts.synthesize(text)
+                logger.info("Synthesizing audio for text: %s", text)
+                audio = self._synthesize(text)
                 if self._stop_event.is_set():
                     break
-                logger.info(f"Playing audio for text: {text}")
+                self._prefetch_next()
+                logger.info("Playing audio for text: %s", text)
                 try:
                     if self._bgm:
                         self._bgm.duck()
-                    play(audio)
+                    self._playback_fn(audio)
                 finally:
                     if self._bgm:
                         self._bgm.unduck()
-                logger.info(f"Played audio for text: {text}")
+                logger.info("Played audio for text: %s", text)
+                self._error_backoff = 0.0
             except Exception:  # noqa: BLE001
                 logger.exception("Failed to synthesize or play audio; item will be dropped")
-            finally:
-                # Mark item as done regardless of success to prevent deadlocks
-                self._queue.task_done()
-
-            # Small sleep to be gentle on CPU
-            time.sleep(0.01)
+                # Back off exponentially while failures repeat (e.g. TTS outage)
+                self._error_backoff = min(max(self._error_backoff * 2, 0.05), 1.0)
+                self._stop_event.wait(self._error_backoff)
 
+        self._executor.shutdown(wait=False, cancel_futures=True)
         logger.info("Consumer stopping.")
+
+    def _next_text(self) -> str:
+        if not self._pending:
+            batch = self._queue.get(timeout=0.2)
+            if not batch:
+                raise Empty
+            self._pending.extend(batch)
+        return self._pending.popleft()
+
+    def _peek_text(self) -> Optional[str]:
+        if self._pending:
+            return self._pending[0]
+        batch = self._queue.peek()
+        return batch[0] if batch else None
+
+    def _synthesize(self, text: str) -> bytes:
+        prefetched, self._prefetched = self._prefetched, None
+        if prefetched is not None:
+            prefetched_text, future = prefetched
+            # Only this thread pops paragraphs, so the peeked one is what we got
+            if prefetched_text is text:
+                return future.result()
+            future.cancel()
+        return self._tts.synthesize(text)
+
+    def _prefetch_next(self) -> None:
+        next_text = self._peek_text()
+        if next_text is not None:
+            self._prefetched = (next_text, self._executor.submit(self._tts.synthesize, next_text))
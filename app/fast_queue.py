@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from queue import Empty, Full
+from typing import Deque, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class FastQueue(Generic[T]):
+    """Bounded FIFO for the single-producer/single-consumer text hand-off.
+
+    ``deque.append`` and ``deque.popleft`` are atomic, so with exactly one
+    producer and one consumer no lock is needed on the fast path. Two Events
+    carry the wake-ups: a blocked side clears its event, re-checks the deque,
+    and only then waits, so a set() from the other side is never lost. There
+    is no unfinished-task bookkeeping (nothing ever calls ``join()``). Raises
+    ``queue.Empty``/``queue.Full`` so callers can keep their existing
+    exception handling.
+    """
+
+    def __init__(self, maxsize: int = 0) -> None:
+        self._maxsize = maxsize
+        self._items: Deque[T] = deque()
+        self._not_empty = threading.Event()
+        self._not_full = threading.Event()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def peek(self) -> Optional[T]:
+        """Return the next item without removing it, or None when empty."""
+        try:
+            return self._items[0]
+        except IndexError:
+            return None
+
+    def _has_room(self) -> bool:
+        return self._maxsize <= 0 or len(self._items) < self._maxsize
+
+    @staticmethod
+    def _wait(event: threading.Event, deadline: Optional[float]) -> bool:
+        if deadline is None:
+            return event.wait()
+        remaining = deadline - time.monotonic()
+        return remaining > 0 and event.wait(remaining)
+
+    def put(self, item: T, block: bool = True, timeout: Optional[float] = None) -> None:
+        if not self._has_room():
+            if not block:
+                raise Full
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                self._not_full.clear()
+                if self._has_room():
+                    break
+                if not self._wait(self._not_full, deadline):
+                    raise Full
+        self._items.append(item)
+        self._not_empty.set()
+
+    def put_nowait(self, item: T) -> None:
+        self.put(item, block=False)
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> T:
+        try:
+            item = self._items.popleft()
+        except IndexError:
+            if not block:
+                raise Empty from None
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                self._not_empty.clear()
+                try:
+                    item = self._items.popleft()
+                    break
+                except IndexError:
+                    pass
+                if not self._wait(self._not_empty, deadline):
+                    raise Empty from None
+        self._not_full.set()
+        return item
+
+    def get_nowait(self) -> T:
+        return self.get(block=False)
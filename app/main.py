@@ -1,17 +1,19 @@
 from __future__ import annotations
 
+import functools
 import logging
 import signal
 import sys
 import threading
 import time
-from queue import Queue
 
 from .config import load_config
 from .producer import ProducerThread, ProducerConfig
 from .consumer import ConsumerThread, ConsumerConfig
 from .tts_elevenlabs import ElevenLabsTTS, ElevenLabsConfig
 from .bgm import BackgroundMusicManager
+from .playback import get_backend
+from .fast_queue import FastQueue
 
 
 logging.basicConfig(
@@ -24,22 +26,27 @@ logger = logging.getLogger(__name__)
 def main() -> int:
     cfg = load_config()
 
-    text_queue: Queue[str] = Queue(maxsize=cfg.queue_maxsize)
+    # Each item is a list of paragraphs: a single paragraph while the producer streams
+    # (the default), a whole batch otherwise; maxsize and the watermark count these items
+    text_queue: FastQueue[list[str]] = FastQueue(maxsize=cfg.queue_maxsize)
 
     stop_event = threading.Event()
     wake_producer_event = threading.Event()
+    items_available = threading.Event()
 
     tts = ElevenLabsTTS(
         ElevenLabsConfig(
             api_key=cfg.elevenlabs_api_key,
             voice_id=cfg.elevenlabs_voice_id,
             model_id=cfg.elevenlabs_model_id,
+            output_format=cfg.elevenlabs_output_format,
         )
     )
 
     producer = ProducerThread(
-        queue=text_queue,
+        queues=[text_queue],
         wake_event=wake_producer_event,
+        items_available=items_available,
         stop_event=stop_event,
         config=ProducerConfig(batch_produce_count=cfg.batch_produce_count),
         name="Producer",
@@ -51,13 +58,20 @@ def main() -> int:
         initial_volume=cfg.bgm_initial_volume,
         ducked_volume=cfg.bgm_ducked_volume,
         fade_seconds=cfg.bgm_fade_seconds,
+        buffer_size=cfg.bgm_buffer_size,
     )
 
     consumer = ConsumerThread(
         queue=text_queue,
         wake_producer_event=wake_producer_event,
+        items_available=items_available,
         stop_event=stop_event,
         tts=tts,
+        playback_fn=functools.partial(
+            get_backend(cfg.playback_backend),
+            output_format=cfg.elevenlabs_output_format,
+            stop_event=stop_event,
+        ),
         config=ConsumerConfig(low_watermark=cfg.low_watermark),
         bgm=bgm_manager,
         name="Consumer",
@@ -73,6 +87,7 @@ def main() -> int:
             first_signal_received = True
             stop_event.set()
             wake_producer_event.set()
+            items_available.set()
         else:
             logger.warning("Second signal received; forcing exit now")
             force_exit_event.set()
@@ -88,31 +103,33 @@ def main() -> int:
     producer.start()
     consumer.start()
 
-    graceful_shutdown_started_at: float | None = None
+    timed_out = False
 
     try:
-        # Wait for threads to stop, but honor force-exit and a grace timeout
-        while (producer.is_alive() or consumer.is_alive()) and not force_exit_event.is_set():
-            producer.join(timeout=0.25)
-            consumer.join(timeout=0.25)
-
-            if stop_event.is_set() and graceful_shutdown_started_at is None:
-                graceful_shutdown_started_at = time.time()
-
-            if graceful_shutdown_started_at is not None:
-                elapsed = time.time() - graceful_shutdown_started_at
-                if elapsed > 5.0:
-                    logger.warning("Graceful shutdown timed out; forcing exit")
+        # Sleep until a signal asks us to stop; nothing polls while the app runs
+        stop_event.wait()
+
+        # Give the threads a grace period, staying responsive to a second signal
+        deadline = time.monotonic() + 5.0
+        for thread in (producer, consumer):
+            while thread.is_alive() and not force_exit_event.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
                     break
+                thread.join(timeout=min(remaining, 0.25))
+        if not force_exit_event.is_set() and (producer.is_alive() or consumer.is_alive()):
+            logger.warning("Graceful shutdown timed out; forcing exit")
+            timed_out = True
     finally:
         stop_event.set()
         wake_producer_event.set()
+        items_available.set()
         try:
             bgm_manager.stop()
         except Exception:  # noqa: BLE001
             logger.exception("Failed to stop background music")
 
-    if force_exit_event.is_set():
+    if force_exit_event.is_set() or timed_out:
         logger.info("Forced exit requested; exiting immediately")
         return 130  # 128 + SIGINT
 
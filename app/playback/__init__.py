@@ -0,0 +1,3 @@
+from .backends import BACKENDS, PlaybackFn, get_backend
+
+__all__ = ["BACKENDS", "PlaybackFn", "get_backend"]
@@ -0,0 +1,156 @@
+"""
+Audio playback backends for synthesized speech.
+
+Every backend has the same signature, ``(audio, *, output_format, stop_event)``,
+and blocks until playback finishes or ``stop_event`` is set. ``get_backend``
+picks one by name (``PLAYBACK_BACKEND`` in the environment).
+"""
+
+from __future__ import annotations
+
+import functools
+import io
+import logging
+import shutil
+import struct
+import subprocess
+import threading
+from typing import Callable, Optional
+
+from elevenlabs.play import play
+
+try:
+    import sounddevice
+except Exception:  # noqa: BLE001
+    sounddevice = None  # type: ignore[assignment]
+
+from ..bgm import SPEECH_CHANNEL, init_mixer, mixer
+
+
+logger = logging.getLogger(__name__)
+
+PlaybackFn = Callable[..., None]
+
+
+@functools.lru_cache(maxsize=None)
+def _pcm_samplerate(output_format: str) -> Optional[int]:
+    """Sample rate of an ElevenLabs ``pcm_<rate>`` format, or None for encoded formats."""
+    if not output_format.startswith("pcm_"):
+        return None
+    return int(output_format.split("_")[1])
+
+
+@functools.lru_cache(maxsize=None)
+def _wav_fmt_chunk(samplerate: int) -> bytes:
+    """The invariant ``fmt `` chunk for 16-bit mono PCM at ``samplerate``."""
+    return struct.pack("<4sIHHIIHH", b"fmt ", 16, 1, 1, samplerate, samplerate * 2, 2, 16)
+
+
+def _pcm_to_wav(pcm: bytes, samplerate: int) -> bytes:
+    """Wrap raw 16-bit mono PCM in a WAV container for players that need a header."""
+    fmt_chunk = _wav_fmt_chunk(samplerate)
+    return b"".join((
+        struct.pack("<4sI4s", b"RIFF", 4 + len(fmt_chunk) + 8 + len(pcm), b"WAVE"),
+        fmt_chunk,
+        struct.pack("<4sI", b"data", len(pcm)),
+        pcm,
+    ))
+
+
+def play_with_elevenlabs(audio: bytes, *, output_format: str, stop_event: threading.Event) -> None:
+    """Play through the ElevenLabs SDK helper (pipes into an ffplay child)."""
+    samplerate = _pcm_samplerate(output_format)
+    play(_pcm_to_wav(audio, samplerate) if samplerate else audio)
+
+
+def play_with_pygame(audio: bytes, *, output_format: str, stop_event: threading.Event) -> None:
+    """Play on the speech channel of the pygame mixer that also carries background music."""
+    if mixer is None:
+        raise RuntimeError("pygame not available; pick another PLAYBACK_BACKEND")
+    init_mixer()
+    samplerate = _pcm_samplerate(output_format)
+    # SDL converts the clip to the mixer's rate/channels when loading it
+    sound = mixer.Sound(file=io.BytesIO(_pcm_to_wav(audio, samplerate) if samplerate else audio))
+    channel = mixer.Channel(SPEECH_CHANNEL)
+    channel.play(sound)
+    while channel.get_busy():
+        if stop_event.wait(timeout=0.05):
+            channel.stop()
+            break
+
+
+def play_with_sounddevice(audio: bytes, *, output_format: str, stop_event: threading.Event) -> None:
+    """Stream PCM to the default output device in-process."""
+    if sounddevice is None:
+        raise RuntimeError("sounddevice not available; pick another PLAYBACK_BACKEND")
+    samplerate = _pcm_samplerate(output_format)
+    if samplerate is None:
+        # Encoded formats need a decoder; leave those to ffplay
+        play_with_elevenlabs(audio, output_format=output_format, stop_event=stop_event)
+        return
+    # Write ~100 ms at a time so a stop request cuts playback short promptly
+    chunk_bytes = samplerate // 10 * 2
+    view = memoryview(audio)
+    with sounddevice.RawOutputStream(samplerate=samplerate, channels=1, dtype="int16") as stream:
+        for offset in range(0, len(view), chunk_bytes):
+            if stop_event.is_set():
+                stream.abort()
+                return
+            stream.write(view[offset:offset + chunk_bytes])
+
+
+@functools.lru_cache(maxsize=1)
+def _player_command() -> tuple[str, ...]:
+    """Resolve ffplay on PATH once per process."""
+    ffplay = shutil.which("ffplay")
+    if ffplay is None:
+        raise RuntimeError("ffplay not found on PATH; install ffmpeg or pick another PLAYBACK_BACKEND")
+    return (ffplay, "-nodisp", "-autoexit", "-loglevel", "error", "-i", "pipe:0")
+
+
+def play_with_subprocess(audio: bytes, *, output_format: str, stop_event: threading.Event) -> None:
+    """Pipe audio into an ffplay child, killing it if a stop is requested.
+
+    One child per utterance keeps boundaries clean; only the PATH lookup is shared.
+    """
+    samplerate = _pcm_samplerate(output_format)
+    if samplerate:
+        audio = _pcm_to_wav(audio, samplerate)
+    proc = subprocess.Popen(
+        _player_command(),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    try:
+        proc.stdin.write(audio)
+        proc.stdin.close()
+        while proc.poll() is None:
+            if stop_event.wait(timeout=0.05):
+                proc.kill()
+                break
+    finally:
+        proc.wait()
+
+
+BACKENDS: dict[str, PlaybackFn] = {
+    "elevenlabs": play_with_elevenlabs,
+    "pygame": play_with_pygame,
+    "sounddevice": play_with_sounddevice,
+    "subprocess": play_with_subprocess,
+}
+
+
+def get_backend(name: str) -> PlaybackFn:
+    """Resolve a backend by name; ``auto`` prefers in-process playback when available."""
+    if name == "auto":
+        if mixer is not None:
+            return play_with_pygame
+        return play_with_sounddevice if sounddevice is not None else play_with_elevenlabs
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise RuntimeError(
+            f"Unknown PLAYBACK_BACKEND {name!r}; expected 'auto' or one of: {', '.join(BACKENDS)}"
+        ) from None
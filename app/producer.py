@@ -1,26 +1,33 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-import os
-import sys
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from queue import Queue
-from typing import Optional
-import random
+from queue import Full
+from typing import Callable, Final, Optional
 
-import google.generativeai as genai
+import httpx
 
 from app.transcript_agent.transcript_agent import TranscriptAgent
-from app.reddit_world_news import run_with_praw
+from app.reddit_world_news import arun_with_praw
 from app.config import load_config
-from app.utils import fetch_news_summary
+from app.utils_cache import acached_fetch_news_summary, stats as summary_cache_stats
+from app.fast_queue import FastQueue
+from app.utils import make_async_http_client
 
 
 logger = logging.getLogger(__name__)
 
+GOODBYE_MESSAGE: Final[str] = (
+    "That's all for tonight's news. Thank you for listening. "
+    "May you have a peaceful and restful sleep. Goodnight."
+)
+FALLBACK_PARAGRAPHS: Final[tuple[str, ...]] = (
+    "Let us move on to the next story. May your mind stay calm and peaceful as you rest.",
+)
+
 
 @dataclass
 class ProducerConfig:
@@ -30,16 +37,18 @@ class ProducerConfig:
     comment_limit: int = 5  # Number of top comments per post
     subreddit: str = "worldnews"
     max_workers: int = 5  # Maximum concurrent threads for fetching summaries
+    transcript_batch_size: int = 3  # News items turned into paragraphs per LLM call
+    stream_paragraphs: bool = True  # Enqueue each paragraph as soon as the LLM finishes it
 
 
-def _fetch_and_process_news_item(news_item: dict) -> Optional[dict]:
+async def _fetch_and_process_news_item(news_item: dict, client: Optional[httpx.AsyncClient] = None) -> Optional[dict]:
     """
     Fetch summary for a single news item and return processed item.
     Returns None if fetching fails.
     """
     try:
-        logger.info(f"Fetching summary for: {news_item['source_url']}")
-        summary = fetch_news_summary(news_item["source_url"])
+        logger.info("Fetching summary for: %s", news_item["source_url"])
+        summary = await acached_fetch_news_summary(news_item["source_url"], client=client)
         
         # Transform to format expected by transcript agent
         processed_item = {
@@ -50,18 +59,56 @@ def _fetch_and_process_news_item(news_item: dict) -> Optional[dict]:
                 for c in news_item["comments"]
             ]
         }
-        logger.info(f"Successfully processed news item: {news_item['source_url']}")
+        logger.info("Successfully processed news item: %s", news_item["source_url"])
         return processed_item
     except Exception as e:  # noqa: BLE001
-        logger.warning(f"Failed to fetch summary for {news_item['source_url']}: {e}. Skipping this news item.")
+        logger.warning("Failed to fetch summary for %s: %s. Skipping this news item.", news_item["source_url"], e)
         return None
 
 
+async def _afetch_news_items(config: ProducerConfig) -> list[dict]:
+    """
+    Stream the Reddit listing and fetch every summary on one event loop.
+
+    Each post's summary starts as soon as the post arrives; at most
+    ``config.max_workers`` summaries are in flight at once. Results keep
+    listing order, with failed items dropped.
+    """
+    limiter = asyncio.Semaphore(config.max_workers)
+
+    async def _fetch(news_item: dict) -> Optional[dict]:
+        async with limiter:
+            return await _fetch_and_process_news_item(news_item, client)
+
+    tasks = []
+    # One pooled HTTP/2 client for every article download and Gemini call in this run
+    client = make_async_http_client()
+    try:
+        async for news_item in arun_with_praw(
+            config=load_config(),
+            timeframe=config.news_timeframe,
+            limit=config.news_limit,
+            comment_limit=config.comment_limit,
+            subreddit=config.subreddit
+        ):
+            tasks.append(asyncio.create_task(_fetch(news_item)))
+        logger.info("Fetched %d news items from Reddit", len(tasks))
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    finally:
+        await client.aclose()
+    return [item for item in results if item is not None]
+
+
 class ProducerThread(threading.Thread):
     def __init__(
         self,
-        queue: Queue[str],
+        queues: list[FastQueue[list[str]]],
         wake_event: threading.Event,
+        items_available: threading.Event,
         stop_event: threading.Event,
         config: ProducerConfig,
         *,
@@ -69,91 +116,117 @@ class ProducerThread(threading.Thread):
         daemon: bool = True,
     ) -> None:
         super().__init__(name=name, daemon=daemon)
-        self._queue = queue
+        # One queue per downstream consumer, so consumers never contend with each other
+        self._queues = queues
         self._wake_event = wake_event
+        self._items_available = items_available
         self._stop_event = stop_event
         self._config = config
 
-        # Initialize transcript agent
+        # Initialize transcript agent and warm it up while Reddit is being fetched
         self._transcript_agent = TranscriptAgent()
+        warm_up = threading.Thread(
+            target=self._warm_up_agent, name="TranscriptWarmUp", daemon=True
+        )
+        warm_up.start()
         
         # Fetch news items from Reddit
         self._news_items = []
         self._current_news_index = 0
         
         try:
-            logger.info(f"Fetching {config.news_limit} news items from r/{config.subreddit}")
-            # Convert generator to list
-            news_generator = run_with_praw(
-                config=load_config(),
-                timeframe=config.news_timeframe,
-                limit=config.news_limit,
-                comment_limit=config.comment_limit,
-                subreddit=config.subreddit
-            )
-            
-            # Collect all news items first
-            news_items_list = list(news_generator)
-            logger.info(f"Fetched {len(news_items_list)} news items from Reddit")
-            
-            # Fetch summaries concurrently using ThreadPoolExecutor
-            logger.info(f"Fetching summaries concurrently with {config.max_workers} workers")
-            with ThreadPoolExecutor(max_workers=config.max_workers) as executor:
-                # Submit all tasks
-                future_to_news = {
-                    executor.submit(_fetch_and_process_news_item, news_item): news_item
-                    for news_item in news_items_list
-                }
-                
-                # Collect results as they complete
-                for future in as_completed(future_to_news):
-                    processed_item = future.result()
-                    if processed_item is not None:
-                        self._news_items.append(processed_item)
+            logger.info("Fetching %d news items from r/%s", config.news_limit, config.subreddit)
+            logger.info("Fetching summaries concurrently with %d workers", config.max_workers)
+            self._news_items = asyncio.run(_afetch_news_items(config))
             
-            logger.info(f"Successfully fetched {len(self._news_items)} news items with summaries")
+            logger.info("Successfully fetched %d news items with summaries", len(self._news_items))
+            logger.info(
+                "Summary cache: %d hits, %d misses",
+                summary_cache_stats["hits"],
+                summary_cache_stats["misses"],
+            )
         except Exception as e:  # noqa: BLE001
-            logger.exception(f"Failed to fetch news from Reddit: {e}")
+            logger.exception("Failed to fetch news from Reddit: %s", e)
             # Provide fallback behavior with empty news list
             self._news_items = []
+        finally:
+            warm_up.join()
+
+    def _warm_up_agent(self) -> None:
+        try:
+            self._transcript_agent.warm_up()
+        except Exception:  # noqa: BLE001
+            logger.exception("Transcript agent warm-up failed; setup will happen on first use")
 
-    def _process_next_news(self) -> Optional[list[str]]:
+    def _process_next_news(self, on_paragraph: Optional[Callable[[str], None]] = None) -> Optional[list[str]]:
         """
-        Process the next news item using the transcript agent.
+        Process the next batch of news items using the transcript agent.
         Returns list of paragraphs or None if no more news.
+
+        When ``on_paragraph`` is given, every returned paragraph (including the
+        fallback) has already been passed to it as soon as it was available.
         """
         if self._current_news_index >= len(self._news_items):
             return None
         
-        news_item = self._news_items[self._current_news_index]
+        start = self._current_news_index
+        batch = self._news_items[start:start + self._config.transcript_batch_size]
         
         try:
-            logger.info(f"Processing news {self._current_news_index + 1}/{len(self._news_items)}: {news_item['url']}")
+            logger.info("Processing news %d-%d/%d", start + 1, start + len(batch), len(self._news_items))
             
             # Prepare input with prefetched summary and comments
-            news_input = {
-                "summary": news_item["summary"],
-                "comments": news_item["comments"]
-            }
+            news_inputs = [
+                {
+                    "summary": news_item["summary"],
+                    "comments": news_item["comments"]
+                }
+                for news_item in batch
+            ]
             
-            # Use transcript agent to generate paragraphs
-            # Add sleep guidance only for the last news item
-            result = self._transcript_agent.process_news(
-                news_input=news_input,
-                add_sleep_guidance=True
+            # Use transcript agent to generate paragraphs for the whole batch in one call
+            results = self._transcript_agent.process_news_batch(
+                news_inputs,
+                add_sleep_guidance_at_end=True,
+                on_paragraph=on_paragraph
             )
             
-            paragraphs = result.get("paragraphs", [])
-            self._current_news_index += 1
+            paragraphs = [p for result in results for p in result.get("paragraphs", [])]
+            self._current_news_index += len(batch)
             
             return paragraphs
         except Exception as e:  # noqa: BLE001
-            logger.exception(f"Failed to process news item: {e}")
-            self._current_news_index += 1
+            logger.exception("Failed to process news items: %s", e)
+            self._current_news_index += len(batch)
             # Return a fallback paragraph
-            return [
-                "Let us move on to the next story. May your mind stay calm and peaceful as you rest."
-            ]
+            if on_paragraph is not None:
+                for paragraph in FALLBACK_PARAGRAPHS:
+                    on_paragraph(paragraph)
+            return list(FALLBACK_PARAGRAPHS)
+
+    def _stream_paragraph(self, paragraph: str) -> None:
+        logger.info("Enqueuing paragraph: %.50s...", paragraph)
+        self._broadcast([paragraph])
+
+    def _broadcast(self, paragraphs: list[str]) -> None:
+        """
+        Hand one batch of paragraphs to every consumer queue as a single item.
+
+        Puts without blocking where there is room; only the queues that are full
+        get a timed put afterwards, so one slow consumer doesn't delay the others.
+        """
+        slow = []
+        for q in self._queues:
+            try:
+                q.put_nowait(paragraphs)
+            except Full:
+                slow.append(q)
+        if len(slow) < len(self._queues):
+            self._items_available.set()
+        for q in slow:
+            q.put(paragraphs, timeout=0.5)
+        if slow:
+            self._items_available.set()
 
     def run(self) -> None:  # noqa: D401
         while not self._stop_event.is_set():
@@ -169,24 +242,24 @@ class ProducerThread(threading.Thread):
                 if self._stop_event.is_set():
                     break
                 try:
-                    # Process the next news item
-                    paragraphs = self._process_next_news()
+                    # Process the next news item; when streaming, paragraphs are
+                    # enqueued one by one while the LLM is still writing the rest
+                    streaming = self._config.stream_paragraphs
+                    paragraphs = self._process_next_news(
+                        on_paragraph=self._stream_paragraph if streaming else None
+                    )
                     
                     if paragraphs is None:
                         # All news consumed, send goodbye message
                         logger.info("All news items processed, sending goodbye message")
-                        goodbye_message = (
-                            "That's all for tonight's news. Thank you for listening. "
-                            "May you have a peaceful and restful sleep. Goodnight."
-                        )
-                        self._queue.put(goodbye_message, timeout=0.5)
+                        self._broadcast([GOODBYE_MESSAGE])
                         # Stop processing after goodbye
                         break
                     
-                    logger.info(f"Produced {len(paragraphs)} paragraphs")
-                    for paragraph in paragraphs:
-                        logger.info(f"Enqueuing paragraph: {paragraph[:50]}...")
-                        self._queue.put(paragraph, timeout=0.5)
+                    logger.info("Produced %d paragraphs", len(paragraphs))
+                    if paragraphs and not streaming:
+                        logger.info("Enqueuing paragraphs starting: %.50s...", paragraphs[0])
+                        self._broadcast(paragraphs)
                 except Exception:  # noqa: BLE001
                     logger.exception("Producer failed to enqueue paragraph")
 
@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 """
-Fetch top posts from r/worldnews with source link + top comments using PRAW (OAuth).
+Fetch top posts from r/worldnews with source link + top comments using Reddit's
+OAuth JSON API.
 
-Requires REDDIT_* environment variables for authentication.
+Requires REDDIT_* environment variables for authentication. The listing is one
+request per page of posts; the comment threads for a page are fetched concurrently.
 
 Outputs:
 - Pretty text (default)
@@ -10,13 +12,33 @@ Outputs:
 """
 
 import argparse
+import asyncio
+import itertools
+import logging
 import sys
-import json
-from typing import Any
+import time
+from typing import Any, AsyncIterator
+
+import httpx
+import orjson
 
 from app.config import load_config, AppConfig
 
 
+logger = logging.getLogger(__name__)
+
+REDDIT_TOKEN_URL = "https://www.reddit.com/api/v1/access_token"
+REDDIT_OAUTH_BASE = "https://oauth.reddit.com"
+LISTING_PAGE_SIZE = 100  # Reddit's per-request maximum
+REMOVED_BODIES = frozenset({"[deleted]", "[removed]"})  # placeholders left by deleted/moderated comments
+COMMENT_MAX_CHARS = 300  # longer comment bodies are cut off; prompts only need the gist
+COMMENT_CONCURRENCY = 8  # comment threads in flight at once; keeps bursts under Reddit's rate limit
+TOKEN_EXPIRY_MARGIN = 60.0  # seconds; refresh a token this long before Reddit expires it
+
+# Bearer tokens by credentials -> (token, monotonic expiry), shared across runs
+_TOKEN_CACHE: dict[tuple[str, str, str, str], tuple[str, float]] = {}
+
+
 def praw_available(config: AppConfig):
     """Check if all required Reddit credentials are available in config."""
     return all([
@@ -26,9 +48,136 @@ def praw_available(config: AppConfig):
         config.reddit_password
     ])
 
+async def _authenticate(client: httpx.AsyncClient, config: AppConfig) -> None:
+    """
+    Attach a script-app bearer token to the client.
+
+    Tokens are cached per credentials until shortly before they expire, so
+    repeated runs in one process skip the OAuth round-trip.
+    """
+    key = (config.reddit_client_id, config.reddit_client_secret, config.reddit_username, config.reddit_password)
+    cached = _TOKEN_CACHE.get(key)
+    if cached is None or cached[1] <= time.monotonic():
+        response = await client.post(
+            REDDIT_TOKEN_URL,
+            auth=(config.reddit_client_id, config.reddit_client_secret),
+            data={
+                "grant_type": "password",
+                "username": config.reddit_username,
+                "password": config.reddit_password,
+            },
+        )
+        response.raise_for_status()
+        payload = response.json()
+        expires_at = time.monotonic() + float(payload.get("expires_in", 3600)) - TOKEN_EXPIRY_MARGIN
+        cached = _TOKEN_CACHE[key] = (payload["access_token"], expires_at)
+    client.headers["Authorization"] = f"bearer {cached[0]}"
+
+
+def _parse_comments(payload: list, comment_limit: int) -> list[dict[str, Any]]:
+    """Extract up to ``comment_limit`` readable top-level comments from a ``/comments/{id}`` response."""
+    # "load more" stubs are kind "more"; real comments always carry these fields.
+    # Noise is dropped before the limit applies, so it doesn't use up slots.
+    comments = (
+        {"author": c["author"], "score": c["score"], "body": c["body"][:COMMENT_MAX_CHARS]}
+        for child in payload[1]["data"]["children"]
+        if child["kind"] == "t1"
+        and not (c := child["data"])["stickied"]
+        and c["author"] != "[deleted]"
+        and c["body"] not in REMOVED_BODIES
+    )
+    return list(itertools.islice(comments, comment_limit))
+
+
+async def _fetch_comments(client: httpx.AsyncClient, post_id: str, comment_limit: int,
+                          limiter: asyncio.Semaphore) -> list[dict[str, Any]]:
+    """
+    Top comments of one post, or an empty list if they can't be fetched.
+
+    A rate-limited, missing or malformed thread only costs that post its
+    comments; the post itself is still yielded.
+    """
+    if comment_limit <= 0:
+        return []
+    try:
+        async with limiter:
+            response = await client.get(
+                f"{REDDIT_OAUTH_BASE}/comments/{post_id}",
+                # Over-ask: stickied/removed comments (often the first child) are dropped afterwards
+                params={"limit": comment_limit * 2 + 1, "sort": "top", "depth": 1, "raw_json": 1},
+            )
+        response.raise_for_status()
+        return _parse_comments(orjson.loads(response.content), comment_limit)
+    except (httpx.HTTPError, orjson.JSONDecodeError, KeyError, IndexError, TypeError) as e:
+        logger.warning("Failed to fetch comments for post %s: %s", post_id, e)
+        return []
+
+
+async def arun_with_praw(config: AppConfig, timeframe: str, limit: int|None, comment_limit: int, subreddit="worldnews") -> AsyncIterator[dict[str, Any]]:
+    """
+    Async generator behind ``run_with_praw``; yields posts in "top" order.
+
+    Each listing page is one request; the comment threads for every post on the
+    page are requested concurrently (at most ``COMMENT_CONCURRENCY`` at a time)
+    and awaited in order.
+    """
+    async with httpx.AsyncClient(
+        http2=True,
+        headers={"User-Agent": config.reddit_user_agent},
+        timeout=30.0,
+    ) as client:
+        await _authenticate(client, config)
+        limiter = asyncio.Semaphore(COMMENT_CONCURRENCY)
+
+        after = None
+        remaining = limit
+        while remaining is None or remaining > 0:
+            params: dict[str, Any] = {
+                "t": timeframe,
+                "limit": LISTING_PAGE_SIZE if remaining is None else min(remaining, LISTING_PAGE_SIZE),
+                "raw_json": 1,
+            }
+            if after:
+                params["after"] = after
+            response = await client.get(f"{REDDIT_OAUTH_BASE}/r/{subreddit}/top", params=params)
+            response.raise_for_status()
+            listing = orjson.loads(response.content)["data"]
+            posts = [child["data"] for child in listing["children"]]
+            if not posts:
+                return
+
+            tasks = [
+                asyncio.ensure_future(_fetch_comments(client, post["id"], comment_limit, limiter))
+                for post in posts
+            ]
+            try:
+                for post, task in zip(posts, tasks):
+                    yield {
+                        "title": post["title"],
+                        "score": post["score"],
+                        "num_comments": post["num_comments"],
+                        "source_url": post["url"],
+                        "author": post.get("author") or "[deleted]",
+                        "id": post["id"],
+                        "comments": await task,
+                    }
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+            if remaining is not None:
+                remaining -= len(posts)
+            after = listing.get("after")
+            if not after:
+                return
+
+
 def run_with_praw(config: AppConfig, timeframe: str, limit: int|None, comment_limit: int, subreddit="worldnews"):
     """
     Generator that yields posts one at a time from the specified subreddit.
+
+    Synchronous wrapper around ``arun_with_praw``: it drives a private event loop,
+    so it can be used from any thread. The name is kept from the PRAW-based version.
     
     Args:
         config: AppConfig object containing Reddit credentials
@@ -56,50 +205,18 @@ def run_with_praw(config: AppConfig, timeframe: str, limit: int|None, comment_li
             if some_condition:
                 break
     """
-    import praw  # pip install praw
-
-    reddit = praw.Reddit(
-        client_id=config.reddit_client_id,
-        client_secret=config.reddit_client_secret,
-        username=config.reddit_username,
-        password=config.reddit_password,
-        user_agent=config.reddit_user_agent,
-    )
-
-    sub = reddit.subreddit(subreddit)
-
-    for post in sub.top(time_filter=timeframe, limit=limit):
-        # fetch comments sorted by 'top'
-        post.comment_sort = "top"
-        post.comment_limit = comment_limit
-        post.comments.replace_more(limit=0)
-
-        comments = []
-        for c in post.comments[:comment_limit]:
+    loop = asyncio.new_event_loop()
+    agen = arun_with_praw(config, timeframe, limit, comment_limit, subreddit=subreddit)
+    try:
+        while True:
             try:
-                body = c.body if isinstance(c.body, str) else str(c.body)
-                if c.stickied or c.author is None:
-                    continue
-                comments.append({
-                    "author": str(c.author),
-                    "score": getattr(c, "score", None),
-                    "body": body,
-                })
-            except Exception:
-                # be robust against deleted/odd objects
-                continue
-
-        source_url = post.url
-        item = {
-            "title": post.title,
-            "score": post.score,
-            "num_comments": post.num_comments,
-            "source_url": source_url,
-            "author": str(post.author) if post.author else "[deleted]",
-            "id": post.id,
-            "comments": comments,
-        }
-        yield item
+                item = loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        loop.run_until_complete(agen.aclose())
+        loop.close()
 
 
 def fetch_posts_paginated(config: AppConfig, timeframe: str, page_size: int, comment_limit: int, subreddit="worldnews", max_posts=None):
@@ -161,11 +278,33 @@ def main():
         print("Please set: REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET, REDDIT_USERNAME, REDDIT_PASSWORD", file=sys.stderr)
         sys.exit(1)
 
-    # Consume the generator - you can also iterate over it directly for true pagination
-    items = list(run_with_praw(config, args.timeframe, args.limit, args.comment_limit, subreddit=args.subreddit))
+    # Write each post as soon as it arrives instead of collecting them all first
+    posts = run_with_praw(config, args.timeframe, args.limit, args.comment_limit, subreddit=args.subreddit)
+    if args.json:
+        _write_json_stream(posts, sys.stdout)
+    else:
+        for i, post in enumerate(posts, start=1):
+            _write_post_text(i, post, sys.stdout)
+
+
+def _write_json_stream(posts, out) -> None:
+    """Write posts as one JSON array, element by element."""
+    out.write("[")
+    for i, post in enumerate(posts):
+        out.write(",\n" if i else "\n")
+        out.write(orjson.dumps(post, option=orjson.OPT_INDENT_2).decode())
+        out.flush()
+    out.write("\n]\n")
+    out.flush()
+
 
-    # Output
-    print(json.dumps(items, ensure_ascii=False, indent=2))
+def _write_post_text(index: int, post: dict[str, Any], out) -> None:
+    out.write(f"{index}. {post['title']} ({post['score']} points, {post['num_comments']} comments)\n")
+    out.write(f"   {post['source_url']}\n")
+    for comment in post["comments"]:
+        out.write(f"   - {comment['author']}: {' '.join(comment['body'].split())}\n")
+    out.write("\n")
+    out.flush()
 
 
 if __name__ == "__main__":
@@ -6,13 +6,41 @@ It maintains context across multiple news items and generates paragraphs suitabl
 bedtime reading.
 """
 
+import asyncio
+import functools
+import hashlib
 import json
-from typing import TypedDict, List, Dict, Any, Annotated
+import logging
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TypedDict, List, Dict, Any, Callable, Optional, Tuple
 from langgraph.graph import StateGraph, END
 from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.runnables import RunnableLambda
 from langchain_google_genai import ChatGoogleGenerativeAI
-import operator
+from pydantic import BaseModel, Field
 
+from app.utils import make_async_http_client
+from app.utils_cache import acached_fetch_news_summary
+
+try:
+    import faiss
+    import numpy as np
+except Exception:  # noqa: BLE001
+    faiss = None  # type: ignore[assignment]
+    np = None  # type: ignore[assignment]
+
+
+logger = logging.getLogger(__name__)
+
+# Paragraphs of earlier news the agent keeps and puts in each prompt for context
+CONTEXT_WINDOW = 3
+# Summary fetches process_batch runs at once
+SUMMARY_CONCURRENCY = 8
+# Summaries shorter than this carry no story, so no LLM call is made for them
+MIN_SUMMARY_CHARS = 30
 
 
 # Define the state structure
@@ -24,8 +52,8 @@ class TranscriptState(TypedDict):
     # Generated paragraphs for current news
     current_paragraphs: List[str]
     
-    # Context: all previously generated paragraphs
-    previous_paragraphs: Annotated[List[str], operator.add]
+    # Context: the most recently generated paragraphs (bounded by the agent)
+    previous_paragraphs: List[str]
     
     # Flag to check if this is the first news item
     is_first_news: bool
@@ -33,107 +61,499 @@ class TranscriptState(TypedDict):
     # Flag to add sleep guidance
     add_sleep_guidance: bool
     
+    # Optional callback; when set, paragraphs are streamed to it as they are generated
+    on_paragraph: Optional[Callable[[str], None]]
+    
     # Final output
     output: Dict[str, Any]
 
 
-def generate_transcript_paragraphs(state: TranscriptState) -> TranscriptState:
+@functools.lru_cache(maxsize=None)
+def _embedding_model(model_name: str):
     """
-    Node to generate transcript paragraphs based on news summary and comments.
-    Uses LLM to create engaging, sleep-friendly content.
+    Load a sentence-transformers model once per process, or None if it isn't installed.
+
+    Imported here rather than at module level: it pulls in torch, which would
+    otherwise slow down every start even when the model is never used.
     """
-    llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash-exp", temperature=0.7)
-    
-    news_summary = state["current_input"]["summary"]
-    comments = state["current_input"].get("comments", [])
-    previous_paragraphs = state.get("previous_paragraphs", [])
-    is_first_news = state.get("is_first_news", False)
-    add_sleep_guidance = state.get("add_sleep_guidance", False)
-    
-    # Build context from previous paragraphs
-    context_info = ""
-    if previous_paragraphs:
-        # Only show last few paragraphs for context
-        recent_context = previous_paragraphs[-3:] if len(previous_paragraphs) > 3 else previous_paragraphs
-        context_info = f"\n\nPrevious paragraphs for context:\n" + "\n".join(recent_context)
-    
-    # Build the prompt
-    prompt_parts = []
-    
-    if is_first_news:
-        prompt_parts.append(
-            "You are creating the opening of a sleep-inducing news podcast. "
-            "Start with a warm greeting like 'Good evening, welcome to Sleepy News Channel, "
-            "and I'm your news anchor Bob.' Keep it calm and soothing."
-        )
-    else:
-        prompt_parts.append(
-            "You are continuing a sleep-inducing news podcast. "
-            "Add a smooth transition from the previous topic. "
-            "Use transitional phrases to connect topics naturally."
-        )
-    
-    prompt_parts.append(f"""
+    try:
+        from sentence_transformers import SentenceTransformer
+    except Exception:  # noqa: BLE001
+        return None
+    return SentenceTransformer(model_name)
+
+
+class TranscriptCache:
+    """
+    Reuses paragraphs generated for the same or a near-duplicate news summary.
+
+    Exact repeats are found by hash. Otherwise the summary embedding is compared
+    with earlier ones, and a cosine similarity above ``threshold`` counts as a hit.
+    Entries only match when the greeting/sleep-guidance flags match too. The
+    semantic tier is skipped when sentence-transformers or faiss isn't installed.
+    """
+
+    def __init__(self, threshold: float = 0.92, model_name: str = "all-MiniLM-L6-v2"):
+        self.threshold = threshold
+        self._model_name = model_name
+        self._exact: Dict[str, List[str]] = {}
+        self._model = None
+        self._index = None
+        self._entries: List[Tuple[Tuple[bool, bool], List[str]]] = []  # row-aligned with the index
+        self._lock = threading.Lock()
+
+    def _load_model(self):
+        """The embedding model, loaded on first use; None when the semantic tier is unavailable."""
+        if faiss is None:
+            return None
+        with self._lock:
+            if self._model is None:
+                model = _embedding_model(self._model_name)
+                if model is None:
+                    return None
+                self._index = faiss.IndexFlatIP(model.get_sentence_embedding_dimension())
+                self._model = model
+            return self._model
+
+    def warm_up(self) -> None:
+        """Load the embedding model ahead of the first lookup."""
+        self._load_model()
+
+    def _embed(self, summary: str):
+        model = self._load_model()
+        if model is None:
+            return None
+        # Normalized vectors make inner product equal to cosine similarity
+        return model.encode([summary], normalize_embeddings=True).astype(np.float32)
+
+    @staticmethod
+    def _exact_key(summary: str, flags: Tuple[bool, bool]) -> str:
+        return hashlib.sha256(f"{flags[0]}|{flags[1]}|{summary}".encode()).hexdigest()
+
+    def lookup(self, summary: str, is_first_news: bool, add_sleep_guidance: bool):
+        """
+        Find cached paragraphs for a summary.
+
+        Returns:
+            Tuple of (paragraphs or None, embedding to hand back to ``store`` on a miss)
+        """
+        flags = (is_first_news, add_sleep_guidance)
+        paragraphs = self._exact.get(self._exact_key(summary, flags))
+        if paragraphs is not None:
+            return paragraphs, None
+
+        vector = self._embed(summary)
+        if vector is None or not self._entries:
+            return None, vector
+        scores, rows = self._index.search(vector, min(5, len(self._entries)))
+        for score, row in zip(scores[0], rows[0]):
+            if score < self.threshold:
+                break
+            entry_flags, entry_paragraphs = self._entries[row]
+            if entry_flags == flags:
+                return entry_paragraphs, vector
+        return None, vector
+
+    def store(self, summary: str, is_first_news: bool, add_sleep_guidance: bool,
+              paragraphs: List[str], vector=None) -> None:
+        """Remember paragraphs generated for a summary."""
+        flags = (is_first_news, add_sleep_guidance)
+        self._exact[self._exact_key(summary, flags)] = paragraphs
+        if vector is not None:
+            self._index.add(vector)
+            self._entries.append((flags, paragraphs))
+
+
+# Fixed pieces of the prompts; the prompt builders only format the summaries,
+# comments and context into them
+_PROMPT_OPEN_FIRST = (
+    "You are creating the opening of a sleep-inducing news podcast. "
+    "Start with a warm greeting like 'Good evening, welcome to Sleepy News Channel, "
+    "and I'm your news anchor Bob.' Keep it calm and soothing."
+)
+_PROMPT_OPEN_CONT = (
+    "You are continuing a sleep-inducing news podcast. "
+    "Add a smooth transition from the previous topic. "
+    "Use transitional phrases to connect topics naturally."
+)
+_PROMPT_BODY_TMPL = """
 Generate a soothing transcript for bedtime news reading with the following requirements:
 
 1. Create 2-3 paragraphs about this news:
-   {news_summary}
+   {summary}
 
 2. If there are short and interesting comments, create 1 paragraph to read one or two original comments in a funny way.
-   {json.dumps(comments, indent=2)}
+{comments}
 
 3. Each paragraph MUST NOT exceed 50 words.
 4. Use a calm, gentle tone suitable for helping someone fall asleep.
 5. Keep the content informative but not alarming or exciting.
-""")
-    
-    if add_sleep_guidance:
-        prompt_parts.append("""
+"""
+_PROMPT_SLEEP_GUIDE = """
 6. Add an intermediate paragraph with gentle sleep guidance (breathing, relaxation, etc.). Sth like "while we are discussiing the news, don't forget to breathe slowly".
    Keep it under 50 words and very soothing.
-""")
-    
-    if context_info:
-        prompt_parts.append(f"""
-Maintain consistency with the previous content:{context_info}
-""")
-    
-    prompt_parts.append("""
-Remember that we are constantly generating new paragraphs, so don't say things like that's it for today's news or good night etc. Just keep talking.
-Output ONLY a JSON array of paragraph strings, nothing else. Format:
-["paragraph 1", "paragraph 2", "paragraph 3", ...]
-""")
-    
-    full_prompt = "\n".join(prompt_parts)
-    
-    # Generate the paragraphs
-    response = llm.invoke([HumanMessage(content=full_prompt)])
-    
-    # Parse the response
+"""
+_PROMPT_CONTEXT_TMPL = """
+Maintain consistency with the previous content:
+
+Previous paragraphs for context:
+{context}
+"""
+_PROMPT_KEEP_TALKING = (
+    "Remember that we are constantly generating new paragraphs, so don't say things like "
+    "that's it for today's news or good night etc. Just keep talking."
+)
+_PROMPT_TAIL = f"""
+{_PROMPT_KEEP_TALKING}
+Return every paragraph as a separate string, in reading order.
+"""
+# Streaming replaces structured output with plain text split on blank lines
+_PROMPT_TAIL_STREAM = f"""
+{_PROMPT_KEEP_TALKING}
+Write the paragraphs as plain text separated by a single blank line. No JSON, headings, numbering or markdown.
+"""
+# The batch prompt shares the opening, context and closing reminder above and
+# lists the items in its own body
+_PROMPT_BATCH_ITEM_TMPL = """News item {index}:
+   Summary: {summary}
+   Comments:
+{comments}"""
+_PROMPT_BATCH_BODY_TMPL = """
+Generate a soothing transcript for bedtime news reading covering the {count} news items below, in order:
+
+{items}
+
+For each news item:
+1. Create 2-3 paragraphs about the news.
+2. If there are short and interesting comments, create 1 paragraph to read one or two original comments in a funny way.
+3. Each paragraph MUST NOT exceed 50 words.
+4. Use a calm, gentle tone suitable for helping someone fall asleep.
+5. Keep the content informative but not alarming or exciting.
+6. Every item after the first opens with a smooth transition from the previous one.
+"""
+_PROMPT_BATCH_SLEEP_GUIDE = """
+7. End the last item with a paragraph of gentle sleep guidance (breathing, relaxation, etc.).
+   Keep it under 50 words and very soothing.
+"""
+_PROMPT_BATCH_TAIL_TMPL = f"""
+{_PROMPT_KEEP_TALKING}
+Return exactly {{count}} lists, one per news item in order; each list holds that item's paragraphs as separate strings.
+"""
+_PROMPT_BATCH_TAIL_STREAM = f"""
+{_PROMPT_KEEP_TALKING}
+Write the paragraphs as plain text separated by a single blank line, and put a line containing only --- between news items. No JSON, headings, numbering or markdown.
+"""
+# Line the model puts between news items in a streamed batch
+_ITEM_SEPARATOR_RE = re.compile(r"^\s*---\s*$", re.MULTILINE)
+# Blank line(s) ending a streamed paragraph
+_PARAGRAPH_BREAK_RE = re.compile(r"\n\s*\n")
+# Markdown code fences the model sometimes wraps plain text in anyway
+_FENCE_RE = re.compile(r"^\s*```[\w-]*\s*|\s*```\s*$")
+
+
+# Precomposed paragraphs read instead of a story whose summary is unusable
+_FALLBACK_OPENING = (
+    "Good evening, welcome to Sleepy News Channel, and I'm your news anchor Bob. "
+    "Settle in, get comfortable, and let the evening slow down with us."
+)
+_FALLBACK_TRANSITION = (
+    "Let's take a quiet moment before our next story. There's no hurry tonight; "
+    "the news will wait while you rest."
+)
+_FALLBACK_FILLER = (
+    "The details of this story didn't reach us tonight, so let's simply pause here. "
+    "Notice how heavy and warm your arms feel, and let your shoulders sink a little lower."
+)
+_FALLBACK_SLEEP_GUIDE = (
+    "Breathe in slowly through your nose, hold it gently for a moment, and let it go. "
+    "With every breath out, let yourself drift a little closer to sleep."
+)
+
+
+def _skip_reason(summary: str) -> Optional[str]:
+    """Why a summary can't be turned into a story, or None if it can."""
+    if summary.startswith("Error:"):
+        return "summary is an error message"
+    if len(summary.strip()) < MIN_SUMMARY_CHARS:
+        return "summary is too short"
+    return None
+
+
+def _fallback_soothing_paragraphs(is_first_news: bool, add_sleep_guidance: bool) -> List[str]:
+    """Paragraphs read in place of a story whose summary is unusable; no LLM call needed."""
+    paragraphs = [_FALLBACK_OPENING if is_first_news else _FALLBACK_TRANSITION, _FALLBACK_FILLER]
+    if add_sleep_guidance:
+        paragraphs.append(_FALLBACK_SLEEP_GUIDE)
+    return paragraphs
+
+
+@functools.cache
+def _get_llm() -> ChatGoogleGenerativeAI:
+    """Shared chat model, so every news item reuses one client and its connection pool."""
+    return ChatGoogleGenerativeAI(model="gemini-2.0-flash-exp", temperature=0.7)
+
+
+class _Paragraphs(BaseModel):
+    """Structured reply for one news item."""
+    paragraphs: List[str] = Field(description="Transcript paragraphs in reading order")
+
+
+class _ParagraphBatches(BaseModel):
+    """Structured reply for a batch of news items."""
+    items: List[List[str]] = Field(description="One list of paragraphs per news item, in input order")
+
+
+def _require_reply(result: Optional[BaseModel], schema: type[BaseModel]) -> BaseModel:
+    # A None result means the reply could not be parsed into the schema
+    if result is None:
+        raise ValueError(f"model reply did not match {schema.__name__}")
+    return result
+
+
+def _invoke_structured(schema: type[BaseModel], prompt: str,
+                       llm: Optional[ChatGoogleGenerativeAI] = None) -> BaseModel:
+    """Ask the model for output matching ``schema``, retrying once on failure."""
+    llm = (llm or _get_llm()).with_structured_output(schema)
+    messages = [HumanMessage(content=prompt)]
     try:
-        # Extract JSON from response
-        content = response.content.strip()
-        # Remove markdown code blocks if present
-        if content.startswith("```"):
-            content = content.split("```")[1]
-            if content.startswith("json"):
-                content = content[4:]
-        content = content.strip()
-        
-        paragraphs = json.loads(content)
-        
-        if not isinstance(paragraphs, list):
-            paragraphs = [content]
-    except json.JSONDecodeError:
-        # Fallback: split by newlines if JSON parsing fails
-        paragraphs = [p.strip() for p in response.content.split("\n\n") if p.strip()]
-    
+        return _require_reply(llm.invoke(messages), schema)
+    except Exception:  # noqa: BLE001 - retried once below
+        return _require_reply(llm.invoke(messages), schema)
+
+
+async def _ainvoke_structured(schema: type[BaseModel], prompt: str,
+                              llm: Optional[ChatGoogleGenerativeAI] = None) -> BaseModel:
+    """Async ``_invoke_structured``."""
+    llm = (llm or _get_llm()).with_structured_output(schema)
+    messages = [HumanMessage(content=prompt)]
+    try:
+        return _require_reply(await llm.ainvoke(messages), schema)
+    except Exception:  # noqa: BLE001 - retried once below
+        return _require_reply(await llm.ainvoke(messages), schema)
+
+
+def _stream_paragraphs(prompt: str, on_paragraph: Callable[[str], None],
+                       llm: Optional[ChatGoogleGenerativeAI] = None) -> List[List[str]]:
+    """
+    Stream a plain-text reply and hand each paragraph to ``on_paragraph`` as soon as it is complete.
+
+    Paragraphs end at a blank line; a ``---`` line starts the next news item.
+
+    Returns:
+        The paragraphs grouped per news item
+    """
+    items: List[List[str]] = [[]]
+
+    def _emit(piece: str) -> None:
+        for i, part in enumerate(_ITEM_SEPARATOR_RE.split(piece)):
+            if i and items[-1]:
+                items.append([])
+            part = _FENCE_RE.sub("", part).strip()
+            if part:
+                items[-1].append(part)
+                on_paragraph(part)
+
+    buffer = ""
+    for chunk in (llm or _get_llm()).stream([HumanMessage(content=prompt)]):
+        if isinstance(chunk.content, str):
+            buffer += chunk.content
+        *complete, buffer = _PARAGRAPH_BREAK_RE.split(buffer)
+        for piece in complete:
+            _emit(piece)
+    _emit(buffer)
+    return [item for item in items if item]
+
+
+def _flatten(items: List[List[str]]) -> List[str]:
+    return [paragraph for item in items for paragraph in item]
+
+
+def _format_comments(comments: List[Any], indent: str = "   ") -> str:
+    """
+    Render comments as a compact bullet list; cheaper in tokens than JSON.
+
+    Bodies are used as given; the Reddit fetcher already caps them at
+    ``COMMENT_MAX_CHARS``.
+    """
+    lines = []
+    for comment in comments:
+        if isinstance(comment, dict):
+            body = " ".join(str(comment.get("body", "")).split())
+            author = comment.get("author")
+            lines.append(f"{indent}- {author}: {body}" if author else f"{indent}- {body}")
+        else:
+            lines.append(f"{indent}- {' '.join(str(comment).split())}")
+    return "\n".join(lines) if lines else f"{indent}(no comments)"
+
+
+def _build_batch_prompt(
+    news_inputs: List[Dict[str, Any]],
+    previous_paragraphs: List[str],
+    is_first_news: bool,
+    add_sleep_guidance_at_end: bool,
+    stream: bool = False,
+) -> str:
+    """Build one prompt asking for the paragraphs of several news items at once."""
+    items = [
+        _PROMPT_BATCH_ITEM_TMPL.format(
+            index=i,
+            summary=news_input["summary"],
+            comments=_format_comments(news_input.get("comments", []), indent="   "),
+        )
+        for i, news_input in enumerate(news_inputs, 1)
+    ]
+    prompt_parts = [
+        _PROMPT_OPEN_FIRST if is_first_news else _PROMPT_OPEN_CONT,
+        _PROMPT_BATCH_BODY_TMPL.format(count=len(news_inputs), items="\n".join(items)),
+    ]
+    if add_sleep_guidance_at_end:
+        prompt_parts.append(_PROMPT_BATCH_SLEEP_GUIDE)
+    if previous_paragraphs:
+        prompt_parts.append(_PROMPT_CONTEXT_TMPL.format(context="\n".join(previous_paragraphs)))
+    prompt_parts.append(_PROMPT_BATCH_TAIL_STREAM if stream else _PROMPT_BATCH_TAIL_TMPL.format(count=len(news_inputs)))
+
+    return "\n".join(prompt_parts)
+
+
+def _direct_response(state: TranscriptState) -> Optional[TranscriptState]:
+    """Answer without the LLM when the summary is an error or too short; None otherwise."""
+    reason = _skip_reason(state["current_input"]["summary"])
+    if reason is None:
+        return None
+    logger.info("Skipping LLM call for news item: %s", reason)
+    paragraphs = _fallback_soothing_paragraphs(
+        state.get("is_first_news", False), state.get("add_sleep_guidance", False)
+    )
+    on_paragraph = state.get("on_paragraph")
+    if on_paragraph is not None:
+        for paragraph in paragraphs:
+            on_paragraph(paragraph)
     return {
         **state,
         "current_paragraphs": paragraphs
     }
 
 
+def _lookup_cached(state: TranscriptState, cache: Optional[TranscriptCache]):
+    """
+    Check the repeat-story cache for this node's input.
+
+    Returns:
+        Tuple of (paragraphs or None, embedding to hand back to ``_store_generated``)
+    """
+    if cache is None:
+        return None, None
+    cached, vector = cache.lookup(
+        state["current_input"]["summary"],
+        state.get("is_first_news", False),
+        state.get("add_sleep_guidance", False),
+    )
+    on_paragraph = state.get("on_paragraph")
+    if cached is not None and on_paragraph is not None:
+        for paragraph in cached:
+            on_paragraph(paragraph)
+    return (list(cached) if cached is not None else None), vector
+
+
+def _build_item_prompt(state: TranscriptState) -> str:
+    """Build the single-item prompt for the current state."""
+    comments = state["current_input"].get("comments", [])
+    previous_paragraphs = state.get("previous_paragraphs", [])
+
+    # Only the per-item fields are formatted; the fixed pieces are module constants
+    prompt_parts = [
+        _PROMPT_OPEN_FIRST if state.get("is_first_news", False) else _PROMPT_OPEN_CONT,
+        _PROMPT_BODY_TMPL.format(
+            summary=state["current_input"]["summary"],
+            comments=_format_comments(comments),
+        ),
+    ]
+    if state.get("add_sleep_guidance", False):
+        prompt_parts.append(_PROMPT_SLEEP_GUIDE)
+    if previous_paragraphs:
+        # Already bounded to the last CONTEXT_WINDOW paragraphs by the agent
+        prompt_parts.append(_PROMPT_CONTEXT_TMPL.format(context="\n".join(previous_paragraphs)))
+    prompt_parts.append(_PROMPT_TAIL if state.get("on_paragraph") is None else _PROMPT_TAIL_STREAM)
+
+    return "\n".join(prompt_parts)
+
+
+def _store_generated(state: TranscriptState, cache: Optional[TranscriptCache],
+                     paragraphs: List[str], vector) -> TranscriptState:
+    if cache is not None:
+        cache.store(
+            state["current_input"]["summary"],
+            state.get("is_first_news", False),
+            state.get("add_sleep_guidance", False),
+            paragraphs,
+            vector,
+        )
+    return {
+        **state,
+        "current_paragraphs": paragraphs
+    }
+
+
+def _prepare_generation(state: TranscriptState, cache: Optional[TranscriptCache]):
+    """
+    Everything a generation node does before calling the LLM.
+
+    Returns:
+        Tuple of (finished state or None, prompt, embedding for ``_store_generated``);
+        when the state is finished no LLM call is needed
+    """
+    direct = _direct_response(state)
+    if direct is not None:
+        return direct, None, None
+
+    cached, vector = _lookup_cached(state, cache)
+    if cached is not None:
+        return {**state, "current_paragraphs": cached}, None, None
+
+    return None, _build_item_prompt(state), vector
+
+
+def generate_transcript_paragraphs(state: TranscriptState, cache: Optional[TranscriptCache] = None,
+                                   llm: Optional[ChatGoogleGenerativeAI] = None) -> TranscriptState:
+    """
+    Node to generate transcript paragraphs based on news summary and comments.
+    Uses LLM to create engaging, sleep-friendly content.
+    """
+    done, prompt, vector = _prepare_generation(state, cache)
+    if done is not None:
+        return done
+
+    on_paragraph = state.get("on_paragraph")
+    if on_paragraph is None:
+        # Generate the paragraphs; the schema makes the model return a validated list
+        paragraphs = _invoke_structured(_Paragraphs, prompt, llm).paragraphs
+    else:
+        paragraphs = _flatten(_stream_paragraphs(prompt, on_paragraph, llm))
+
+    return _store_generated(state, cache, paragraphs, vector)
+
+
+async def agenerate_transcript_paragraphs(state: TranscriptState, cache: Optional[TranscriptCache] = None,
+                                          llm: Optional[ChatGoogleGenerativeAI] = None) -> TranscriptState:
+    """
+    Async version of ``generate_transcript_paragraphs``, used by ``graph.ainvoke``.
+
+    Streaming still reads the reply on a worker thread, so ``on_paragraph`` is
+    called from that thread.
+    """
+    done, prompt, vector = _prepare_generation(state, cache)
+    if done is not None:
+        return done
+
+    on_paragraph = state.get("on_paragraph")
+    if on_paragraph is None:
+        paragraphs = (await _ainvoke_structured(_Paragraphs, prompt, llm)).paragraphs
+    else:
+        paragraphs = _flatten(await asyncio.to_thread(_stream_paragraphs, prompt, on_paragraph, llm))
+
+    return _store_generated(state, cache, paragraphs, vector)
+
+
 def prepare_output(state: TranscriptState) -> TranscriptState:
     """
     Node to prepare the final output in JSON format.
@@ -144,20 +564,63 @@ def prepare_output(state: TranscriptState) -> TranscriptState:
     
     return {
         **state,
-        "output": output,
-        "previous_paragraphs": state["current_paragraphs"]  # Add to context
+        "output": output
     }
 
 
+@dataclass
+class _Segment:
+    """A run of batch items answered together: replayed from the cache, or by one LLM call."""
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    flags: List[Tuple[bool, bool]] = field(default_factory=list)  # (is_first_news, add_sleep_guidance) per item
+    vectors: List[Any] = field(default_factory=list)  # embeddings for TranscriptCache.store
+    cached: Optional[List[str]] = None  # set for a single-item cache hit
+
+    @property
+    def add_sleep_guidance(self) -> bool:
+        return self.flags[-1][1]
+
+
+def _checked_batches(batches: List[List[str]], news_inputs: List[Dict[str, Any]]) -> List[List[str]]:
+    if len(batches) != len(news_inputs):
+        raise ValueError("batch response does not have one paragraph list per item")
+    return batches
+
+
+def _guidance_flags(news_inputs: List[Dict[str, Any]], add_sleep_guidance_at_end: bool):
+    """Pair each item with whether it ends in sleep guidance (only the last one can)."""
+    last = len(news_inputs) - 1
+    return [(news_input, add_sleep_guidance_at_end and i == last) for i, news_input in enumerate(news_inputs)]
+
+
+def _merge_subset(news_inputs: List[Dict[str, Any]], subset: List[Dict[str, Any]],
+                  results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Spread the results for ``subset`` back over ``news_inputs``; left-out items get no paragraphs."""
+    results_iter = iter(results)
+    return [
+        next(results_iter, {"paragraphs": []}) if any(n is u for u in subset) else {"paragraphs": []}
+        for n in news_inputs
+    ]
+
+
 class TranscriptAgent:
     """
     LangGraph-based agent for generating sleep-friendly news transcripts.
     """
     
-    def __init__(self):
-        """Initialize the transcript agent with LangGraph workflow."""
+    def __init__(self, llm: Optional[ChatGoogleGenerativeAI] = None):
+        """
+        Initialize the transcript agent with LangGraph workflow.
+
+        Args:
+            llm: Chat model to generate with; the shared Gemini client if omitted
+        """
+        # Built once and handed to the graph node, never per news item
+        self.llm = llm if llm is not None else _get_llm()
+        self.cache = TranscriptCache()  # Reuse paragraphs for repeated/near-duplicate stories
         self.graph = self._build_graph()
-        self.context_paragraphs = []  # Maintain context across invocations
+        # Rolling context across invocations; exactly what goes in the next prompt
+        self.context_paragraphs = deque(maxlen=CONTEXT_WINDOW)
         self.news_count = 0  # Track how many news items processed
         
     def _build_graph(self) -> StateGraph:
@@ -165,7 +628,14 @@ class TranscriptAgent:
         workflow = StateGraph(TranscriptState)
         
         # Add nodes
-        workflow.add_node("generate_paragraphs", generate_transcript_paragraphs)
+        # Sync and async implementations, so both graph.invoke and graph.ainvoke work
+        workflow.add_node(
+            "generate_paragraphs",
+            RunnableLambda(
+                functools.partial(generate_transcript_paragraphs, cache=self.cache, llm=self.llm),
+                afunc=functools.partial(agenerate_transcript_paragraphs, cache=self.cache, llm=self.llm),
+            ),
+        )
         workflow.add_node("prepare_output", prepare_output)
         
         # Add edges
@@ -175,41 +645,262 @@ class TranscriptAgent:
         
         return workflow.compile()
     
-    def process_news(self, news_input: Dict[str, Any], add_sleep_guidance: bool = False) -> Dict[str, Any]:
+    def warm_up(self) -> None:
+        """
+        Pay one-time setup costs (embedding model) before the first news item.
+
+        Safe to call from a background thread while news is still being fetched.
+        """
+        self.cache.warm_up()
+
+    def process_news(self, news_input: Dict[str, Any], add_sleep_guidance: bool = False,
+                     on_paragraph: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """
         Process a news item and generate transcript paragraphs.
         
         Args:
             news_input: Dictionary with 'summary' and 'comments' keys
             add_sleep_guidance: Whether to add sleep guidance paragraph at the end
+            on_paragraph: If given, called with each paragraph as soon as it is generated
             
         Returns:
             Dictionary with 'paragraphs' key
         """
-        self.news_count += 1
-        is_first = self.news_count == 1
-        
-        # Prepare initial state
-        initial_state = {
-            "current_input": news_input,
-            "current_paragraphs": [],
-            "previous_paragraphs": self.context_paragraphs.copy(),
-            "is_first_news": is_first,
-            "add_sleep_guidance": add_sleep_guidance,
-            "output": {}
-        }
-        
         # Run the graph
-        result = self.graph.invoke(initial_state)
+        result = self.graph.invoke(self._initial_state(news_input, add_sleep_guidance, on_paragraph))
         
         # Update context with new paragraphs (but not the input)
         self.context_paragraphs.extend(result["current_paragraphs"])
         
         return result["output"]
+
+    async def aprocess_news(self, news_input: Dict[str, Any], add_sleep_guidance: bool = False,
+                            on_paragraph: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """Async ``process_news``; runs the graph with ``ainvoke``."""
+        result = await self.graph.ainvoke(self._initial_state(news_input, add_sleep_guidance, on_paragraph))
+        self.context_paragraphs.extend(result["current_paragraphs"])
+        return result["output"]
+
+    def _initial_state(self, news_input: Dict[str, Any], add_sleep_guidance: bool,
+                       on_paragraph: Optional[Callable[[str], None]]) -> TranscriptState:
+        self.news_count += 1
+        return {
+            "current_input": news_input,
+            "current_paragraphs": [],
+            "previous_paragraphs": list(self.context_paragraphs),
+            "is_first_news": self.news_count == 1,
+            "add_sleep_guidance": add_sleep_guidance,
+            "on_paragraph": on_paragraph,
+            "output": {}
+        }
+
+    async def process_batch(self, news_list: List[Dict[str, Any]], add_sleep_guidance_at_end: bool = False,
+                            on_paragraph: Optional[Callable[[str], None]] = None) -> List[Dict[str, Any]]:
+        """
+        Summarize several news items concurrently, then generate all their paragraphs in one LLM call.
+
+        Items without a 'summary' have it fetched from their 'url' (at most
+        ``SUMMARY_CONCURRENCY`` at a time, sharing one HTTP client). The
+        paragraphs come from ``aprocess_news_batch``, so the greeting,
+        transitions and sleep guidance are written once for the whole batch.
+
+        Args:
+            news_list: List of dictionaries with 'comments' and either 'summary' or 'url'
+            add_sleep_guidance_at_end: Whether the last item ends with sleep guidance
+            on_paragraph: If given, called with each paragraph as soon as it is generated
+
+        Returns:
+            List of dictionaries with 'paragraphs' key, one per input item
+        """
+        limiter = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+
+        async with make_async_http_client() as client:
+            async def _with_summary(news_item: Dict[str, Any]) -> Dict[str, Any]:
+                if "summary" in news_item:
+                    return news_item
+                async with limiter:
+                    summary = await acached_fetch_news_summary(news_item["url"], client=client)
+                return {**news_item, "summary": summary}
+
+            news_inputs = await asyncio.gather(*(_with_summary(item) for item in news_list))
+
+        return await self.aprocess_news_batch(
+            news_inputs, add_sleep_guidance_at_end=add_sleep_guidance_at_end, on_paragraph=on_paragraph
+        )
     
+    def process_news_batch(self, news_inputs: List[Dict[str, Any]], add_sleep_guidance_at_end: bool = False,
+                           on_paragraph: Optional[Callable[[str], None]] = None) -> List[Dict[str, Any]]:
+        """
+        Generate transcript paragraphs for several news items with a single LLM call.
+
+        Items found in the repeat-story cache are replayed instead of generated;
+        the misses around them are still batched, one LLM call per run. Falls back to one ``process_news`` call per item if the response can't be
+        split back into per-item paragraph lists. When streaming, paragraphs have
+        already been handed out, so there is no fallback and the per-item split
+        follows the model's item separators. Items whose summary is an error or
+        too short are left out of the prompt and get no paragraphs.
+
+        Args:
+            news_inputs: List of dictionaries with 'summary' and 'comments' keys
+            add_sleep_guidance_at_end: Whether the last item ends with sleep guidance
+            on_paragraph: If given, called with each paragraph as soon as it is generated
+
+        Returns:
+            List of dictionaries with 'paragraphs' key, one per input item
+        """
+        subset = self._usable_subset(news_inputs)
+        if subset is not None:
+            return _merge_subset(news_inputs, subset,
+                                 self.process_news_batch(subset, add_sleep_guidance_at_end, on_paragraph))
+
+        if len(news_inputs) <= 1:
+            return [
+                self.process_news(news_input, add_sleep_guidance=add_sleep_guidance_at_end, on_paragraph=on_paragraph)
+                for news_input in news_inputs
+            ]
+
+        results = []
+        for segment in self._plan_segments(news_inputs, add_sleep_guidance_at_end):
+            if segment.cached is not None:
+                results.extend(self._replay_cached(segment, on_paragraph))
+                continue
+
+            prompt = self._batch_prompt(segment, stream=on_paragraph is not None)
+            if on_paragraph is not None:
+                results.extend(self._record_batch(segment, _stream_paragraphs(prompt, on_paragraph, self.llm)))
+                continue
+
+            try:
+                batches = _checked_batches(_invoke_structured(_ParagraphBatches, prompt, self.llm).items, segment.items)
+            except Exception:  # noqa: BLE001
+                results.extend(
+                    self.process_news(news_input, add_sleep_guidance=guidance)
+                    for news_input, guidance in _guidance_flags(segment.items, segment.add_sleep_guidance)
+                )
+                continue
+            results.extend(self._record_batch(segment, batches))
+        return results
+
+    async def aprocess_news_batch(self, news_inputs: List[Dict[str, Any]], add_sleep_guidance_at_end: bool = False,
+                                  on_paragraph: Optional[Callable[[str], None]] = None) -> List[Dict[str, Any]]:
+        """Async ``process_news_batch``; the fallback runs ``aprocess_news`` per item."""
+        subset = self._usable_subset(news_inputs)
+        if subset is not None:
+            return _merge_subset(news_inputs, subset,
+                                 await self.aprocess_news_batch(subset, add_sleep_guidance_at_end, on_paragraph))
+
+        if len(news_inputs) <= 1:
+            return [
+                await self.aprocess_news(news_input, add_sleep_guidance=add_sleep_guidance_at_end, on_paragraph=on_paragraph)
+                for news_input in news_inputs
+            ]
+
+        results = []
+        # Embedding the summaries for the cache lookup is CPU work; keep it off the event loop
+        for segment in await asyncio.to_thread(self._plan_segments, news_inputs, add_sleep_guidance_at_end):
+            if segment.cached is not None:
+                results.extend(self._replay_cached(segment, on_paragraph))
+                continue
+
+            prompt = self._batch_prompt(segment, stream=on_paragraph is not None)
+            if on_paragraph is not None:
+                results.extend(self._record_batch(
+                    segment, await asyncio.to_thread(_stream_paragraphs, prompt, on_paragraph, self.llm)
+                ))
+                continue
+
+            try:
+                batches = _checked_batches(
+                    (await _ainvoke_structured(_ParagraphBatches, prompt, self.llm)).items, segment.items
+                )
+            except Exception:  # noqa: BLE001
+                for news_input, guidance in _guidance_flags(segment.items, segment.add_sleep_guidance):
+                    results.append(await self.aprocess_news(news_input, add_sleep_guidance=guidance))
+                continue
+            results.extend(self._record_batch(segment, batches))
+        return results
+
+    @staticmethod
+    def _usable_subset(news_inputs: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        The items of a multi-item batch worth an LLM call, or None if that is all of them.
+
+        If none is usable, the first item is kept so it produces the fallback paragraphs.
+        """
+        if len(news_inputs) <= 1:
+            return None
+        usable = []
+        for news_input in news_inputs:
+            reason = _skip_reason(news_input["summary"])
+            if reason is None:
+                usable.append(news_input)
+            else:
+                logger.info("Leaving news item out of the batch: %s", reason)
+        if len(usable) == len(news_inputs):
+            return None
+        return usable or news_inputs[:1]
+
+    def _plan_segments(self, news_inputs: List[Dict[str, Any]], add_sleep_guidance_at_end: bool) -> List[_Segment]:
+        """
+        Look every item up in the repeat-story cache and split the batch around the hits.
+
+        Each hit becomes its own segment; consecutive misses share one, so they
+        still cost a single LLM call.
+        """
+        segments: List[_Segment] = []
+        last = len(news_inputs) - 1
+        for i, news_input in enumerate(news_inputs):
+            flags = (self.news_count == 0 and i == 0, add_sleep_guidance_at_end and i == last)
+            cached, vector = self.cache.lookup(news_input["summary"], *flags)
+            if cached is not None:
+                segments.append(_Segment([news_input], [flags], [vector], list(cached)))
+                continue
+            if not segments or segments[-1].cached is not None:
+                segments.append(_Segment())
+            segments[-1].items.append(news_input)
+            segments[-1].flags.append(flags)
+            segments[-1].vectors.append(vector)
+        return segments
+
+    def _batch_prompt(self, segment: _Segment, stream: bool) -> str:
+        return _build_batch_prompt(
+            segment.items,
+            list(self.context_paragraphs),
+            is_first_news=segment.flags[0][0],
+            add_sleep_guidance_at_end=segment.add_sleep_guidance,
+            stream=stream,
+        )
+
+    def _replay_cached(self, segment: _Segment,
+                       on_paragraph: Optional[Callable[[str], None]]) -> List[Dict[str, Any]]:
+        if on_paragraph is not None:
+            for paragraph in segment.cached:
+                on_paragraph(paragraph)
+        return self._record_batch(segment, [segment.cached], store=False)
+
+    def _record_batch(self, segment: _Segment, batches: List[List[str]],
+                      store: bool = True) -> List[Dict[str, Any]]:
+        """
+        Add a segment's paragraphs to the rolling context, cache them per item and
+        shape the per-item output.
+
+        If the paragraphs can't be matched to the items (a streamed reply with the
+        wrong number of separators), they all go to the first item, the others get
+        none, and nothing is cached. There is always one result per item.
+        """
+        self.news_count += len(segment.items)
+        for paragraphs in batches:
+            self.context_paragraphs.extend(paragraphs)
+        if len(batches) != len(segment.items):
+            batches = [_flatten(batches)] + [[] for _ in segment.items[1:]]
+        elif store:
+            for news_input, flags, vector, paragraphs in zip(segment.items, segment.flags, segment.vectors, batches):
+                self.cache.store(news_input["summary"], *flags, paragraphs, vector)
+        return [{"paragraphs": paragraphs} for paragraphs in batches]
+
     def reset_context(self):
         """Reset the agent's context for a new session."""
-        self.context_paragraphs = []
+        self.context_paragraphs.clear()
         self.news_count = 0
 
 
@@ -1,21 +1,29 @@
 from __future__ import annotations
 
 import logging
+import threading
 import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterator, Optional
 
 from elevenlabs.client import ElevenLabs
 from elevenlabs.types.voice_settings import VoiceSettings
 
+from .cache import DiskCache, cache_key
+
 logger = logging.getLogger(__name__)
 
+# Synthesized clips only change with the voice settings, so keep them for a month
+TTS_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+
 
 @dataclass
 class ElevenLabsConfig:
     api_key: str
     voice_id: str
     model_id: str = "eleven_turbo_v2"
+    # pcm_* formats are raw 16-bit little-endian mono at the given sample rate
+    output_format: str = "mp3_44100_128"
 
 
 class ElevenLabsTTS:
@@ -23,24 +31,43 @@ class ElevenLabsTTS:
         self._config = config
         self._timeout_seconds = timeout_seconds
         self._client = ElevenLabs(api_key=config.api_key)
+        self._cache = DiskCache("tts", ttl=TTS_CACHE_TTL_SECONDS)
+        self._hits = 0
+        self._misses = 0
+        # synthesize() runs on the consumer and on its prefetch thread
+        self._stats_lock = threading.Lock()
+
+    def cache_info(self) -> dict[str, int]:
+        """Hit/miss counts of the synthesis cache for this instance."""
+        with self._stats_lock:
+            return {"hits": self._hits, "misses": self._misses}
 
     def synthesize(self, text: str, max_retries: int = 2, retry_backoff_seconds: float = 1.0) -> bytes:
+        # Same text with the same voice, model and format always sounds the same
+        key = cache_key(self._config.voice_id, self._config.model_id, self._config.output_format, text)
+        audio = self._cache.get(key)
+        if audio:
+            with self._stats_lock:
+                self._hits += 1
+            return audio
+
+        with self._stats_lock:
+            self._misses += 1
+        audio = self._download(text, max_retries, retry_backoff_seconds)
+        # An empty reply is a glitch, not a clip worth replaying for a month
+        if audio:
+            self._cache.set(key, audio)
+        return audio
+
+    def _download(self, text: str, max_retries: int, retry_backoff_seconds: float) -> bytes:
+        """Fetch a whole clip, retrying the full request on any failure."""
         if not text:
             raise ValueError("text must be non-empty")
 
         last_exc: Optional[Exception] = None
         for attempt in range(1, max_retries + 1):
             try:
-                audio = self._client.text_to_speech.convert(
-                    text=text,
-                    voice_id=self._config.voice_id,
-                    model_id=self._config.model_id,
-                    voice_settings=VoiceSettings(
-                        speed=0.5,
-                    ),
-                    output_format="mp3_44100_128",
-                )
-                return b''.join(audio)
+                return b"".join(self._convert(text))
             except Exception as exc:  # noqa: BLE001
                 last_exc = exc
                 logger.exception("ElevenLabs TTS request failed on attempt %d", attempt)
@@ -51,3 +78,14 @@ class ElevenLabsTTS:
         if last_exc:
             raise last_exc
         raise RuntimeError("Failed to synthesize speech after retries")
+
+    def _convert(self, text: str) -> Iterator[bytes]:
+        return self._client.text_to_speech.convert(
+            text=text,
+            voice_id=self._config.voice_id,
+            model_id=self._config.model_id,
+            voice_settings=VoiceSettings(
+                speed=0.5,
+            ),
+            output_format=self._config.output_format,
+        )
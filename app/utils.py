@@ -1,128 +1,378 @@
 """
 Utility functions for the sleep assistant application.
+
+Each network step has a blocking version and an ``a``-prefixed coroutine
+version; both share the same caches.
 """
 
+import asyncio
+import io
+import mimetypes
 import os
-import tempfile
+import threading
+from typing import BinaryIO, Optional
+
 import httpx
 import markitdown
+import orjson
 import requests
+from cachetools import TTLCache
+from markitdown.converters import HtmlConverter, PdfConverter, PlainTextConverter
+from requests.adapters import HTTPAdapter
 
+from app.cache import DiskCache, cache_key
 
-def _fetch_text_local(url: str) -> str:
-    """Convert a document file to text using markitdown.
+try:
+    import trafilatura
+except Exception:  # noqa: BLE001
+    trafilatura = None  # type: ignore[assignment]
 
-    Args:
-        url: URL of the PDF file
 
-    Returns:
-        str: Extracted text from the PDF
+# Download settings for article pages; browser-like headers avoid 403 errors
+DOWNLOAD_TIMEOUT = httpx.Timeout(connect=20.0, read=10.0, write=10.0, pool=None)
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1'
+}
+# Pages are streamed in chunks and abandoned past the size cap; gzip/brotli
+# bodies are decompressed on the fly (brotli needs the brotli package)
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+MAX_DOWNLOAD_BYTES = 20 * 1024 * 1024
+# HTTP/2 forbids connection-specific headers; pooling keeps connections alive anyway
+_POOLED_HEADERS = {k: v for k, v in BROWSER_HEADERS.items() if k != 'Connection'}
+_POOL_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+
+
+GEMINI_MODEL = "gemini-2.5-flash-preview-09-2025"
+GEMINI_TIMEOUT = 60.0
+# The key goes in a header, so the URL is fixed for the process
+_GEMINI_URL = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent"
+GEMINI_SYSTEM_PROMPT = (
+    "You are an expert news article extractor. Your task is to analyze the "
+    "provided text, which has been scraped from a news webpage, and return "
+    "the summary of the news article. You must remove all advertisements, "
+    "navigation links, related articles sections, comments, author bios, "
+    "and any other non-essential text. The output should be the clean, "
+    "readable news article, including its title and body. The output should be no more than 200 words."
+)
+
+def _make_markitdown() -> markitdown.MarkItDown:
     """
+    A converter limited to the formats news links actually serve.
+
+    The built-in set also probes images (OCR), audio, YouTube, ZIP and Office
+    formats on every call; only plain text, HTML (when trafilatura comes up
+    empty) and PDF are registered here.
+    """
+    md = markitdown.MarkItDown(enable_builtins=False, enable_plugins=False)
+    md.register_converter(PlainTextConverter(), priority=markitdown.PRIORITY_GENERIC_FILE_FORMAT)
+    md.register_converter(HtmlConverter(), priority=markitdown.PRIORITY_GENERIC_FILE_FORMAT)
+    md.register_converter(PdfConverter(), priority=markitdown.PRIORITY_SPECIFIC_FILE_FORMAT)
+    return md
+
 
+# One converter for the process, shared by every download
+_MD = _make_markitdown()
+
+# Extracted page text by URL, and Gemini summaries by page text. Summaries are
+# exact-match only: pages sharing boilerplate (nav text, paywall stubs) embed
+# almost identically, and a similarity hit would read out the wrong story.
+_PAGE_TEXT_CACHE = DiskCache("pages")
+# In-process tier in front of _PAGE_TEXT_CACHE, so repeat URLs skip disk reads too
+_PAGE_TEXT_MEMO: TTLCache = TTLCache(maxsize=256, ttl=60 * 60)
+_PAGE_TEXT_MEMO_LOCK = threading.Lock()
+_GEMINI_SUMMARY_CACHE = DiskCache("gemini-summaries")
+
+
+def make_http_client() -> httpx.Client:
+    """Create a pooled HTTP/2 client suitable for sharing across summary fetches."""
+    return httpx.Client(
+        http2=True,
+        timeout=DOWNLOAD_TIMEOUT,
+        headers=_POOLED_HEADERS,
+        follow_redirects=True,
+        limits=_POOL_LIMITS,
+    )
+
+
+# Process-wide connection pools for the blocking API: page downloads default to
+# _HTTP, Gemini calls go through _GEMINI_SESSION
+_HTTP = make_http_client()
+_GEMINI_SESSION = requests.Session()
+_GEMINI_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
+
+def make_async_http_client() -> httpx.AsyncClient:
+    """Async counterpart of ``make_http_client``."""
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=DOWNLOAD_TIMEOUT,
+        headers=_POOLED_HEADERS,
+        follow_redirects=True,
+        limits=_POOL_LIMITS,
+    )
+
+
+def _convert_document(url: str, body: BinaryIO, content_type: str = "") -> str:
+    """Convert a downloaded document to text using markitdown, entirely in memory."""
     try:
-        # Create a temporary file to store the downloaded document
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-            # Download the document file
-            timeout = httpx.Timeout(connect=20.0, read=10.0, write=10.0, pool=None)
-            # Add browser-like headers to avoid 403 errors
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1'
-            }
-            with httpx.Client(timeout=timeout, headers=headers, follow_redirects=True) as client:
-                response = client.get(url)
-                if response.status_code != 200:
-                    print(f"Failed to download document from {url}")
-                    raise ValueError(f"Failed to download document from {url}, status code: {response.status_code}")
-
-                # Save the downloaded content to the temporary file
-                temp_file.write(response.content)
-                temp_file.flush()
-
-                # Convert document to text using markitdown
-                result = markitdown.MarkItDown().convert(temp_file.name)
-                if result and result.text_content:
-                    print(f"Successfully extracted text from {url}")
-                    return str(result.text_content)
-                else:
-                    print(f"No text content found in {url}")
-                    raise ValueError(f"No text content found in {url}")
+        # The extension is only a hint; markitdown also sniffs the bytes
+        extension = mimetypes.guess_extension(content_type.split(";")[0].strip()) if content_type else None
+        result = _MD.convert_stream(body, file_extension=extension, url=url)
+        if result and result.text_content:
+            print(f"Successfully extracted text from {url}")
+            return str(result.text_content)
+        else:
+            print(f"No text content found in {url}")
+            raise ValueError(f"No text content found in {url}")
     except Exception as e:
         print(f"Error converting document to text: {str(e)}")
         raise e
-    finally:
-        # Clean up the temporary file
-        try:
-            os.unlink(temp_file.name)
-        except Exception as e:
-            print(f"Failed to delete temporary file {temp_file.name}: {str(e)}")
 
 
-def get_news_from_gemini(page_text: str) -> str:
+def _extract_text(url: str, body: io.BytesIO, content_type: str) -> str:
     """
-    Uses the Gemini API to extract the main news article from cleaned webpage text.
+    Turn a downloaded page into text.
+
+    HTML goes through trafilatura's main-content extraction, which skips
+    navigation and boilerplate and needs no temp file. PDFs, plain text and
+    HTML trafilatura can't handle fall back to markitdown; other formats
+    (Office documents, images) aren't registered there and raise.
+    """
+    if trafilatura is not None and "text/html" in content_type:
+        # trafilatura detects the charset itself when given bytes
+        text = trafilatura.extract(
+            body.getvalue(),
+            output_format="markdown",
+            include_comments=False,
+            include_tables=False,
+            favor_precision=True,
+        )
+        if text:
+            print(f"Successfully extracted text from {url}")
+            return text
+    body.seek(0)
+    return _convert_document(url, body, content_type)
+
+
+def _check_download(url: str, response: httpx.Response) -> None:
+    if response.status_code != 200:
+        print(f"Failed to download document from {url}")
+        raise ValueError(f"Failed to download document from {url}, status code: {response.status_code}")
+
+
+def _append_chunk(url: str, body: io.BytesIO, chunk: bytes) -> None:
+    body.write(chunk)
+    if body.tell() > MAX_DOWNLOAD_BYTES:
+        raise ValueError(f"Document at {url} is larger than {MAX_DOWNLOAD_BYTES} bytes")
+
+
+def _download(url: str, client: httpx.Client) -> tuple[io.BytesIO, str]:
+    """Stream a page into memory; returns the (decompressed) body and its content type."""
+    body = io.BytesIO()
+    with client.stream("GET", url) as response:
+        _check_download(url, response)
+        for chunk in response.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+            _append_chunk(url, body, chunk)
+        content_type = response.headers.get("content-type", "")
+    body.seek(0)
+    return body, content_type
+
+
+async def _adownload(url: str, client: httpx.AsyncClient) -> tuple[io.BytesIO, str]:
+    """Async ``_download``."""
+    body = io.BytesIO()
+    async with client.stream("GET", url) as response:
+        _check_download(url, response)
+        async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+            _append_chunk(url, body, chunk)
+        content_type = response.headers.get("content-type", "")
+    body.seek(0)
+    return body, content_type
+
+
+def _cached_page_text(key: str) -> Optional[str]:
+    with _PAGE_TEXT_MEMO_LOCK:
+        text = _PAGE_TEXT_MEMO.get(key)
+    if text is None:
+        text = _PAGE_TEXT_CACHE.get(key)
+        if text is not None:
+            with _PAGE_TEXT_MEMO_LOCK:
+                _PAGE_TEXT_MEMO[key] = text
+    return text
+
+
+def _store_page_text(key: str, text: str) -> None:
+    with _PAGE_TEXT_MEMO_LOCK:
+        _PAGE_TEXT_MEMO[key] = text
+    _PAGE_TEXT_CACHE.set(key, text)
+
+
+def _fetch_text_local(url: str, client: Optional[httpx.Client] = None) -> str:
+    """Convert a document file to text using markitdown.
 
     Args:
-        page_text: The cleaned text extracted from the webpage.
+        url: URL of the PDF file
+        client: HTTP client to download with; the module's pooled client if omitted
 
     Returns:
-        The extracted news article text, or an error message.
+        str: Extracted text from the PDF
     """
+    key = cache_key(url)
+    cached = _cached_page_text(key)
+    if cached is not None:
+        return cached
+
+    # Download the document file
+    body, content_type = _download(url, client if client is not None else _HTTP)
+
+    text = _extract_text(url, body, content_type)
+    _store_page_text(key, text)
+    return text
+
+
+async def _afetch_text_local(url: str, client: Optional[httpx.AsyncClient] = None) -> str:
+    """Async ``_fetch_text_local``; cache access and text extraction run in worker threads."""
+    key = cache_key(url)
+    cached = await asyncio.to_thread(_cached_page_text, key)
+    if cached is not None:
+        return cached
+
+    if client is None:
+        async with httpx.AsyncClient(timeout=DOWNLOAD_TIMEOUT, headers=BROWSER_HEADERS, follow_redirects=True) as own_client:
+            body, content_type = await _adownload(url, own_client)
+    else:
+        body, content_type = await _adownload(url, client)
+
+    text = await asyncio.to_thread(_extract_text, url, body, content_type)
+    await asyncio.to_thread(_store_page_text, key, text)
+    return text
+
+
+def _gemini_precheck(page_text: str) -> Optional[str]:
+    """Return an in-band error message if the Gemini call can't be made, else None."""
     if not page_text:
         return "Error: No text was provided to analyze."
 
     # Securely get the API key from an environment variable
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
+    if not os.getenv("GEMINI_API_KEY"):
         return (
             "Error: GEMINI_API_KEY environment variable not set.\n"
             "Please set the environment variable with your API key."
         )
+    return None
 
-    api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-preview-09-2025:generateContent?key={api_key}"
 
-    system_prompt = (
-        "You are an expert news article extractor. Your task is to analyze the "
-        "provided text, which has been scraped from a news webpage, and return "
-        "the summary of the news article. You must remove all advertisements, "
-        "navigation links, related articles sections, comments, author bios, "
-        "and any other non-essential text. The output should be the clean, "
-        "readable news article, including its title and body. The output should be no more than 200 words."
-    )
+def _gemini_headers() -> dict:
+    # Read per call: load_config() may populate the environment after import
+    return {"Content-Type": "application/json", "x-goog-api-key": os.getenv("GEMINI_API_KEY", "")}
+
 
-    payload = {
+def _gemini_payload(page_text: str) -> bytes:
+    """Request body for generateContent, serialized with orjson."""
+    return orjson.dumps({
         "contents": [{"parts": [{"text": page_text}]}],
         "systemInstruction": {
-            "parts": [{"text": system_prompt}]
+            "parts": [{"text": GEMINI_SYSTEM_PROMPT}]
         },
         "generationConfig": {
             "temperature": 0.1,
             "maxOutputTokens": 2048,
         }
-    }
+    })
 
+
+def _gemini_cache_key(page_text: str) -> str:
+    return cache_key(" ".join(page_text.split()), GEMINI_SYSTEM_PROMPT, GEMINI_MODEL)
+
+
+def _parse_gemini_result(result: dict, key: str) -> str:
+    """Pull the summary out of a generateContent reply and cache it."""
     try:
-        response = requests.post(api_url, json=payload, headers={'Content-Type': 'application/json'})
-        response.raise_for_status()
-        result = response.json()
-        
         candidate = result.get('candidates', [{}])[0]
         if 'content' in candidate and 'parts' in candidate['content']:
-            return candidate['content']['parts'][0].get('text', "Error: Could not extract text from API response.")
+            summary = candidate['content']['parts'][0].get('text')
+            if summary is None:
+                return "Error: Could not extract text from API response."
+            _GEMINI_SUMMARY_CACHE.set(key, summary)
+            return summary
         else:
             return f"Error: The API response did not contain the expected content. Response: {result}"
-            
-    except requests.exceptions.RequestException as e:
-        return f"Error: API request failed. Reason: {e}"
     except (KeyError, IndexError) as e:
         return f"Error: Failed to parse API response. Reason: {e}. Response: {result}"
 
 
-def webpage_to_summary(url: str) -> str:
+def get_news_from_gemini(page_text: str) -> str:
+    """
+    Uses the Gemini API to extract the main news article from cleaned webpage text.
+
+    Args:
+        page_text: The cleaned text extracted from the webpage.
+
+    Returns:
+        The extracted news article text, or an error message.
+    """
+    error = _gemini_precheck(page_text)
+    if error:
+        return error
+
+    key = _gemini_cache_key(page_text)
+    cached = _GEMINI_SUMMARY_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        response = _GEMINI_SESSION.post(
+            _GEMINI_URL, data=_gemini_payload(page_text), headers=_gemini_headers(), timeout=GEMINI_TIMEOUT
+        )
+        response.raise_for_status()
+        result = orjson.loads(response.content)
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+        return f"Error: API request failed. Reason: {e}"
+    return _parse_gemini_result(result, key)
+
+
+async def aget_news_from_gemini(page_text: str, client: Optional[httpx.AsyncClient] = None) -> str:
+    """
+    Async ``get_news_from_gemini``.
+
+    Args:
+        page_text: The cleaned text extracted from the webpage.
+        client: Optional shared async HTTP client for the API request
+
+    Returns:
+        The extracted news article text, or an error message.
+    """
+    error = _gemini_precheck(page_text)
+    if error:
+        return error
+
+    key = _gemini_cache_key(page_text)
+    # Disk reads stay off the event loop, which is also running other downloads
+    cached = await asyncio.to_thread(_GEMINI_SUMMARY_CACHE.get, key)
+    if cached is not None:
+        return cached
+
+    try:
+        if client is None:
+            async with httpx.AsyncClient(timeout=GEMINI_TIMEOUT) as own_client:
+                response = await own_client.post(_GEMINI_URL, content=_gemini_payload(page_text), headers=_gemini_headers())
+        else:
+            response = await client.post(
+                _GEMINI_URL, content=_gemini_payload(page_text), headers=_gemini_headers(), timeout=GEMINI_TIMEOUT
+            )
+        response.raise_for_status()
+        result = orjson.loads(response.content)
+    except (httpx.HTTPError, orjson.JSONDecodeError) as e:
+        return f"Error: API request failed. Reason: {e}"
+    return await asyncio.to_thread(_parse_gemini_result, result, key)
+
+
+def webpage_to_summary(url: str, client: Optional[httpx.Client] = None) -> str:
     """
     Tool to extract and summarize webpage content.
     
@@ -133,25 +383,39 @@ def webpage_to_summary(url: str) -> str:
     
     Args:
         url: The URL of the news webpage
+        client: Optional shared HTTP client for the page download
         
     Returns:
         A summary of the webpage content
     """
-    page_text = _fetch_text_local(url)
+    page_text = _fetch_text_local(url, client=client)
     return get_news_from_gemini(page_text)
 
 
-def fetch_news_summary(url: str) -> str:
+async def awebpage_to_summary(url: str, client: Optional[httpx.AsyncClient] = None) -> str:
+    """Async ``webpage_to_summary``; the client is shared by the download and the Gemini call."""
+    page_text = await _afetch_text_local(url, client=client)
+    return await aget_news_from_gemini(page_text, client=client)
+
+
+def fetch_news_summary(url: str, client: Optional[httpx.Client] = None) -> str:
     """
     Fetch and summarize the news from the provided URL.
     
     Args:
         url: The URL of the news webpage
+        client: Optional shared HTTP client for the page download
         
     Returns:
         A summary of the news article
     """
-    summary = webpage_to_summary(url)
+    summary = webpage_to_summary(url, client=client)
     print(f"Summary: {summary}")
     return summary
 
+
+async def afetch_news_summary(url: str, client: Optional[httpx.AsyncClient] = None) -> str:
+    """Async ``fetch_news_summary``."""
+    summary = await awebpage_to_summary(url, client=client)
+    print(f"Summary: {summary}")
+    return summary
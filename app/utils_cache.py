@@ -0,0 +1,68 @@
+"""
+Persistent on-disk cache for news summaries, keyed by source URL.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Optional
+
+import httpx
+
+from app.cache import DiskCache, cache_key
+from app.utils import afetch_news_summary, fetch_news_summary
+
+
+SUMMARY_TTL_SECONDS = 24 * 60 * 60
+_SUMMARY_CACHE = DiskCache("summaries", ttl=SUMMARY_TTL_SECONDS)
+
+# Hit/miss counters for the current process; read them for logging
+stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(kind: str) -> None:
+    with _stats_lock:
+        stats[kind] += 1
+
+
+def cached_fetch_news_summary(url: str, client: Optional[httpx.Client] = None) -> str:
+    """
+    Same as ``fetch_news_summary`` but served from disk when the URL was
+    summarized within the last ``SUMMARY_TTL_SECONDS``.
+
+    Args:
+        url: The URL of the news webpage
+        client: Optional shared HTTP client for the page download
+
+    Returns:
+        A summary of the news article
+    """
+    key = cache_key(url)
+    summary = _SUMMARY_CACHE.get(key)
+    if summary is not None:
+        _count("hits")
+        return summary
+
+    _count("misses")
+    summary = fetch_news_summary(url, client=client)
+    # get_news_from_gemini reports failures in-band; don't pin those for a day
+    if not summary.startswith("Error:"):
+        _SUMMARY_CACHE.set(key, summary)
+    return summary
+
+
+async def acached_fetch_news_summary(url: str, client: Optional[httpx.AsyncClient] = None) -> str:
+    """Async ``cached_fetch_news_summary``; the disk cache is read and written off the event loop."""
+    key = cache_key(url)
+    summary = await asyncio.to_thread(_SUMMARY_CACHE.get, key)
+    if summary is not None:
+        _count("hits")
+        return summary
+
+    _count("misses")
+    summary = await afetch_news_summary(url, client=client)
+    if not summary.startswith("Error:"):
+        await asyncio.to_thread(_SUMMARY_CACHE.set, key, summary)
+    return summary